@@ -85,45 +85,53 @@ def build_polygon(tips, color):
     return g
 
 
+def get_inscribed_tower(spectrum, p, depth):
+    """
+    Vertices of all the inscribed polygons at once. The inscribe step v[i] -> (1 - p) * v[i] + p * v[i + 1]
+    is a circulant matrix diagonalized by the DFT with the eigenvalues 1 - p + p * exp(2 pi i j / n),
+    so the polygon of the depth k is ifft(eigenvalues ** k * fft(bounds)).
+    :param spectrum: fft of the (n, 3) bounds along the vertices
+    :return: (depth + 1, n, 3) vertices, the bounds first
+    """
+    n = len(spectrum)
+    eigenvalues = 1 - p + p * np.exp(2j * np.pi * np.arange(n) / n)
+    powers = eigenvalues[np.newaxis, :] ** np.arange(depth + 1)[:, np.newaxis]
+    return np.fft.ifft(powers[..., np.newaxis] * spectrum, axis=1).real
+
+
 class InscribedPolygons:
 
     @staticmethod
     def connect_polygon(vertices, color):
-        g = VGroup()
-        for start, end in zip_to_pairs(vertices):
-            g += Line(start, end, color=color)
-        return g
+        return Polygon(*vertices, color=color)
 
     @staticmethod
-    def update_polygon(group, vertices):
-        for (start, end), line in zip(zip_to_pairs(vertices), group):
-            line.put_start_and_end_on(start, end)
+    def update_polygon(polygon, vertices):
+        polygon.set_points_as_corners(np.vstack((vertices, vertices[:1])))
 
     def __init__(self, bounds, depth=5, p=0.15, color=COLOR):
-        self.bounds = bounds
+        self.bounds = np.array(bounds, dtype=float)
         self.depth = depth
-        self.vertices = [bounds]
-        self.groups = VGroup()
-        self.groups.add(InscribedPolygons.connect_polygon(bounds, color))
-
-        for _ in range(depth):
-            self.vertices.append(inscribe(self.vertices[-1], p))
-            self.groups.add(InscribedPolygons.connect_polygon(self.vertices[-1], color))
+        self.spectrum = np.fft.fft(self.bounds, axis=0)
+        self.vertices = get_inscribed_tower(self.spectrum, p, depth)
+        self.groups = VGroup(*[InscribedPolygons.connect_polygon(v, color) for v in self.vertices])
 
     def update_bounds(self):
-        self.bounds = [line.get_start() for line in self.groups[0]]
+        self.bounds = np.array(self.groups[0].get_vertices())
+        self.spectrum = np.fft.fft(self.bounds, axis=0)
         self.vertices[0] = self.bounds
 
     def set_p(self, p):
-        self.vertices = self.vertices[:1]
-        for i in range(self.depth):
-            self.vertices.append(inscribe(self.vertices[-1], p))
-            InscribedPolygons.update_polygon(self.groups[i + 1], self.vertices[-1])
+        self.vertices = get_inscribed_tower(self.spectrum, p, self.depth)
+        for polygon, vertices in zip(self.groups[1:], self.vertices[1:]):
+            InscribedPolygons.update_polygon(polygon, vertices)
 
 
 class Scenario(Scene):
     SQUARE_SIDE = 4.0
     DEPTH = 9
+    # one AnimationGroup per depth, DEPTH + 1 plays instead of 6 * DEPTH with the same timing
+    BATCH_PLAYS = True
 
     def play_intro(self) -> Mobject:
         dot = Dot(color=COLOR)
@@ -137,21 +145,28 @@ class Scenario(Scene):
         tips = get_square_tips(Scenario.SQUARE_SIDE)
 
         p = 0.15
-        dots = VGroup(*[Dot(color=BLUE) for _ in range(4)])
         lines = VGroup()
+        batches = [[]]
         for i in range(Scenario.DEPTH):
             tips = inscribe(tips, p)
-            for dot, tip in zip(dots, tips):
-                dot.move_to(tip)
+            dots = VGroup(*[Dot(color=BLUE).move_to(tip) for tip in tips])
             runtime_base = (Scenario.DEPTH - i) / Scenario.DEPTH
-            self.play(FadeIn(dots), run_time=0.3 * runtime_base)
+            batches[-1].append(FadeIn(dots, run_time=0.3 * runtime_base))
 
             for start, end in zip_to_pairs(tips):
                 line = Line(start, end, color=COLOR)
-                self.play(ShowCreation(line), run_time=0.4 * runtime_base)
+                batches[-1].append(ShowCreation(line, run_time=0.4 * runtime_base))
                 lines += line
 
-            self.play(FadeOut(dots), run_time=0.2 * runtime_base)
+            # a group interpolates all its animations every frame, so it can't fade the same dots in and out
+            batches.append([FadeOut(dots, run_time=0.2 * runtime_base)])
+
+        for batch in batches:
+            if Scenario.BATCH_PLAYS:
+                self.play(AnimationGroup(*batch, lag_ratio=1))
+            else:
+                for animation in batch:
+                    self.play(animation)
         self.wait(1)
         self.play(FadeOut(lines))
 
@@ -0,0 +1,126 @@
+"""
+Vertices of analytic shapes as contiguous (n, 3) float arrays.
+
+Curves are sampled adaptively by their curvature: the angular step of an arc is the largest one
+for which the chords deviate from the arc by at most the tolerance, so a curve gets as many
+vertices as its size on the screen needs instead of a fixed step of the parameter, e.g. a circle
+of the radius 4 gets 141 vertices instead of 629 with the step of 0.01.
+The shapes are memoized by their parameters, every call returns a new array.
+"""
+from functools import lru_cache
+from typing import Optional
+
+import numpy as np
+from geometry.utils import ArrayLike, as_points
+
+TAU = 2 * np.pi
+
+# max distance between a curve and its polyline in scene units, the frame is 8 units high
+TOLERANCE = 1e-3
+
+ORIGIN = (0.0, 0.0, 0.0)
+
+
+def arc_step(radius: float, tolerance: float = TOLERANCE) -> float:
+    """
+    The largest angular step for which the chords deviate from the arc of the radius at most by the tolerance
+    """
+    return 2 * np.arccos(max(1 - tolerance / radius, 0.0))
+
+
+@lru_cache(maxsize=256)
+def _arc(radius: float, start_angle: float, angle: float, step: float) -> np.ndarray:
+    n = max(int(np.ceil(abs(angle) / step)), 1) + 1
+    theta = np.linspace(start_angle, start_angle + angle, n)
+    vertices = np.zeros((n, 3))
+    vertices[:, 0] = np.cos(theta) * radius
+    vertices[:, 1] = np.sin(theta) * radius
+    vertices.setflags(write=False)
+    return vertices
+
+
+@lru_cache(maxsize=256)
+def _regular_polygon(radius: float, start_angle: float, n: int) -> np.ndarray:
+    theta = start_angle + np.arange(n) * (TAU / n)
+    vertices = np.zeros((n, 3))
+    vertices[:, 0] = np.cos(theta) * radius
+    vertices[:, 1] = np.sin(theta) * radius
+    vertices.setflags(write=False)
+    return vertices
+
+
+def arc(radius: float, start_angle: float, angle: float, center: ArrayLike = ORIGIN,
+        step: Optional[float] = None, tolerance: float = TOLERANCE) -> np.ndarray:
+    """
+    :param angle: counterclockwise if positive, clockwise if negative
+    :param step: fixed angular step, adaptive by the tolerance if None
+    :return: (n, 3) vertices from the start to the end of the arc, both included
+    """
+    if step is None:
+        step = arc_step(radius, tolerance)
+    return _arc(float(radius), float(start_angle), float(angle), float(step)) + as_points(center)
+
+
+def regular_polygon(radius: float, start_angle: float, n: int, center: ArrayLike = ORIGIN) -> np.ndarray:
+    """
+    :return: (n, 3) vertices counterclockwise, the first one at the start angle
+    """
+    return _regular_polygon(float(radius), float(start_angle), int(n)) + as_points(center)
+
+
+class JinJangVertices:
+    """
+    Outlines of the Jin-Jang symbol centered at the origin. The S line goes from the top
+    to the bottom and bulges to the right in the upper half. The halves of the circle and
+    the middle S exclude their ends, so they are concatenated into closed polygons as is.
+    """
+
+    def __init__(self, radius: float, step: Optional[float] = None, tolerance: float = TOLERANCE):
+        """
+        :param step: fixed angular step, adaptive by the tolerance if None
+        """
+        self.radius = radius
+        self.step = step
+        self.tolerance = tolerance
+
+    def _arc(self, radius: float, start_angle: float, angle: float, center: ArrayLike = ORIGIN) -> np.ndarray:
+        return arc(radius, start_angle, angle, center, self.step, self.tolerance)
+
+    def get_left_half_circle(self) -> np.ndarray:
+        """
+        From the bottom through the left to the top
+        """
+        return self._arc(self.radius, 3 * TAU / 4, -TAU / 2)[:-1]
+
+    def get_right_half_circle(self) -> np.ndarray:
+        """
+        From the bottom through the right to the top
+        """
+        return self._arc(self.radius, -TAU / 4, TAU / 2)[:-1]
+
+    def get_s_curve(self) -> np.ndarray:
+        """
+        The S line from the top to the bottom, both ends included
+        """
+        r_2 = self.radius / 2
+        upper = self._arc(r_2, TAU / 4, -TAU / 2, (0.0, r_2, 0.0))
+        lower = self._arc(r_2, TAU / 4, TAU / 2, (0.0, -r_2, 0.0))
+        return np.concatenate((upper, lower[1:]))
+
+    def get_middle_s(self) -> np.ndarray:
+        return self.get_s_curve()[:-1]
+
+    def get_s_func(self, t: float):
+        r_2 = self.radius / 2
+        if 0 <= t <= TAU / 2:
+            return np.array([np.sin(t) * r_2, np.cos(t) * r_2 + r_2, 0])
+        elif TAU / 2 < t <= TAU:
+            return np.array([-np.sin(t - TAU / 2) * r_2, np.cos(t - TAU / 2) * r_2 - r_2, 0])
+        else:
+            raise ValueError(f"t should be between [0, TAU]")
+
+    def get_full_circle(self) -> np.ndarray:
+        """
+        Clockwise from the top, closed: the last vertex is the first one
+        """
+        return self._arc(self.radius, TAU / 4, -TAU)
@@ -0,0 +1,95 @@
+"""
+Orders of visiting the cells of an n x n grid, for block animations and reveal effects.
+
+A traversal is a read-only (n * n, 2) int array of (row, col) of the cells in the order of
+visiting, built with array operations and cached per n. ranks() inverts it into an (n, n)
+array of the step at which every cell is visited, e.g. to reveal a grid at the time t:
+    opacity = np.clip(t * speed - ranks(hilbert(n)), 0, 1)
+"""
+from functools import lru_cache
+
+import numpy as np
+
+# right, down, left, up in (row, col)
+_SPIRAL_DIRECTIONS = np.array([(0, 1), (1, 0), (0, -1), (-1, 0)])
+
+
+def _readonly(cells: np.ndarray) -> np.ndarray:
+    cells.setflags(write=False)
+    return cells
+
+
+@lru_cache(maxsize=32)
+def square_spiral(n: int) -> np.ndarray:
+    """
+    Clockwise spiral from the center: right, down, left, up with legs of 1, 1, 2, 2, ..., n - 1, n - 1, n - 1 steps
+    """
+    legs = np.append(np.repeat(np.arange(1, n), 2), n - 1)
+    directions = _SPIRAL_DIRECTIONS[np.repeat(np.arange(len(legs)) % 4, legs)]
+    cells = np.empty((n * n, 2), dtype=int)
+    cells[0] = ((n - 1) // 2, (n - 1) // 2)
+    cells[1:] = cells[0] + np.cumsum(directions, axis=0)
+    return _readonly(cells)
+
+
+@lru_cache(maxsize=32)
+def serpentine(n: int) -> np.ndarray:
+    """
+    Rows from the top, odd rows from the right to the left
+    """
+    rows = np.repeat(np.arange(n), n)
+    cols = np.tile(np.arange(n), n)
+    cols = np.where(rows % 2 == 1, n - 1 - cols, cols)
+    return _readonly(np.stack((rows, cols), axis=1))
+
+
+@lru_cache(maxsize=32)
+def z_order(n: int) -> np.ndarray:
+    """
+    Morton order: bits of the step interleave the bits of the column and the row.
+    Grids of other sizes than powers of two keep the order of the cells inside the grid.
+    """
+    bits = max(int(n - 1).bit_length(), 1)
+    d = np.arange(1 << (2 * bits))
+    rows, cols = np.zeros_like(d), np.zeros_like(d)
+    for b in range(bits):
+        cols |= ((d >> (2 * b)) & 1) << b
+        rows |= ((d >> (2 * b + 1)) & 1) << b
+    inside = (rows < n) & (cols < n)
+    return _readonly(np.stack((rows[inside], cols[inside]), axis=1))
+
+
+@lru_cache(maxsize=32)
+def hilbert(n: int) -> np.ndarray:
+    """
+    Hilbert curve from the top left to the top right cell, n is a power of two
+    """
+    if n & (n - 1) != 0:
+        raise ValueError(f"Hilbert curve needs the size of a power of two, got {n}")
+    t = np.arange(n * n)
+    x, y = np.zeros_like(t), np.zeros_like(t)
+    s = 1
+    while s < n:
+        rx = (t // 2) & 1
+        ry = (t ^ rx) & 1
+        # rotate the quadrant
+        flip = (ry == 0) & (rx == 1)
+        x = np.where(flip, s - 1 - x, x)
+        y = np.where(flip, s - 1 - y, y)
+        x, y = np.where(ry == 0, y, x), np.where(ry == 0, x, y)
+        x += s * rx
+        y += s * ry
+        t //= 4
+        s *= 2
+    return _readonly(np.stack((y, x), axis=1))
+
+
+def ranks(cells: np.ndarray) -> np.ndarray:
+    """
+    :param cells: (n * n, 2) traversal
+    :return: (n, n) step at which every cell is visited
+    """
+    n = int(np.sqrt(len(cells)))
+    result = np.empty((n, n), dtype=int)
+    result[cells[:, 0], cells[:, 1]] = np.arange(len(cells))
+    return result
@@ -1,15 +1,34 @@
-from math import sqrt
-from dataclasses import dataclass
-from typing import List
+"""
+Planar geometry kernel.
+
+Points are float arrays of shape (..., 2) or (..., 3), the z coordinate is carried along
+and ignored by the planar operations, so the results can be passed to manim as is.
+All operations broadcast over the leading dimensions: a single point, a set of points
+or a set of points for every frame of an animation are handled by the same call.
+Point is a scalar point for the code which works with one point at a time.
+"""
+from typing import List, Sequence, Union
+
+import numpy as np
+
+ArrayLike = Union[np.ndarray, Sequence[float], Sequence[Sequence[float]]]
 
 
-@dataclass
 class Point:
-    x: float
-    y: float
+    __slots__ = ("x", "y")
+
+    def __init__(self, x: float, y: float):
+        self.x = x
+        self.y = y
 
-    def to_array(self):
-        return [self.x, self.y, 0]
+    def __repr__(self):
+        return f"Point(x={self.x}, y={self.y})"
+
+    def __eq__(self, that):
+        return isinstance(that, Point) and self.x == that.x and self.y == that.y
+
+    def to_array(self) -> np.ndarray:
+        return np.array((self.x, self.y, 0.0))
 
     def middle(self, that: "Point") -> "Point":
         return Point((self.x + that.x) / 2, (self.y + that.y) / 2)
@@ -18,35 +37,128 @@ class Point:
         return (self.x - that.x) ** 2 + (self.y - that.y) ** 2
 
     def find_nearest(self, points: List["Point"]) -> "Point":
-        return min(points, key=lambda p: self.dist2(p))
+        return points[int(np.argmin(dist2(self.to_array(), as_points(points))))]
 
     def find_farthest(self, points: List["Point"]) -> "Point":
-        return max(points, key=lambda p: self.dist2(p))
+        return points[int(np.argmax(dist2(self.to_array(), as_points(points))))]
 
     @staticmethod
     def from_array(a: List[float]):
         return Point(a[0], a[1])
 
 
-def find_circles_intersection(a: Point, b: Point, r: float) -> List[Point]:
-    o = a.middle(b)
-    l2 = o.dist2(a)
+def as_points(points: Union[ArrayLike, List[Point]]) -> np.ndarray:
+    """
+    :return: float array of shape (..., 3) from Points, (nested) lists of Points or arrays of 2D/3D coordinates
+    """
+    if isinstance(points, Point):
+        return points.to_array()
+    if isinstance(points, (list, tuple)) and len(points) > 0 and isinstance(points[0], (Point, list, tuple)):
+        return np.array([as_points(p) for p in points])
+    points = np.asarray(points, dtype=float)
+    if points.shape[-1] == 2:
+        points = np.concatenate((points, np.zeros(points.shape[:-1] + (1,))), axis=-1)
+    return points
+
+
+def midpoint(a: ArrayLike, b: ArrayLike) -> np.ndarray:
+    return (np.asarray(a, dtype=float) + np.asarray(b, dtype=float)) / 2
+
+
+def dist2(a: ArrayLike, b: ArrayLike) -> np.ndarray:
+    """
+    Squared planar distance between a and b, broadcast over the leading dimensions
+    """
+    d = np.asarray(a, dtype=float)[..., :2] - np.asarray(b, dtype=float)[..., :2]
+    return np.einsum("...i,...i->...", d, d)
+
+
+def nearest(p: ArrayLike, points: ArrayLike) -> np.ndarray:
+    """
+    :param p: (..., d) points
+    :param points: (..., k, d) candidates for every point
+    :return: (..., d) the nearest candidate for every point
+    """
+    return _select(p, points, np.argmin)
 
-    if l2 > r ** 2:
-        return []
 
-    if abs(a.x - b.x) > abs(a.y - b.y):
-        alpha = (o.y - a.y) / (o.x - a.x)
-        beta = sqrt((r ** 2 - l2) / (1 + alpha ** 2))
-        return [
-            Point(o.x - alpha * beta, o.y + beta),
-            Point(o.x + alpha * beta, o.y - beta)
-        ]
+def farthest(p: ArrayLike, points: ArrayLike) -> np.ndarray:
+    """
+    Same as nearest, the farthest candidate; NaN candidates are never selected
+    """
+    return _select(p, points, np.argmax)
 
+
+def _select(p: ArrayLike, points: ArrayLike, arg_func) -> np.ndarray:
+    points = np.asarray(points, dtype=float)
+    d2 = dist2(np.asarray(p, dtype=float)[..., np.newaxis, :], points)
+    if arg_func is np.argmax:
+        d2 = np.where(np.isnan(d2), -np.inf, d2)
     else:
-        alpha = (o.x - a.x) / (o.y - a.y)
-        beta = sqrt((r ** 2 - l2) / (1 + alpha ** 2))
-        return [
-            Point(o.x - beta, o.y + alpha * beta),
-            Point(o.x + beta, o.y - alpha * beta)
-        ]
+        d2 = np.where(np.isnan(d2), np.inf, d2)
+    i = arg_func(d2, axis=-1)
+    return np.take_along_axis(points, i[..., np.newaxis, np.newaxis], axis=-2)[..., 0, :]
+
+
+def rotate_about(x: ArrayLike, o: ArrayLike, angle: Union[float, np.ndarray]) -> np.ndarray:
+    """
+    Rotates points x about centers o counterclockwise by angle
+    :param angle: scalar or an array broadcast against the leading dimensions of x and o
+    """
+    x = np.asarray(x, dtype=float)
+    o = np.asarray(o, dtype=float)
+    angle = np.asarray(angle, dtype=float)
+    c, s = np.cos(angle), np.sin(angle)
+    dx, dy = x[..., 0] - o[..., 0], x[..., 1] - o[..., 1]
+
+    result = np.empty(np.broadcast_shapes(x.shape[:-1], o.shape[:-1], angle.shape) + x.shape[-1:])
+    result[...] = x
+    result[..., 0] = o[..., 0] + c * dx - s * dy
+    result[..., 1] = o[..., 1] + s * dx + c * dy
+    return result
+
+
+def circles_intersections(a: ArrayLike, b: ArrayLike, ra: Union[float, np.ndarray],
+                          rb: Union[float, np.ndarray]) -> np.ndarray:
+    """
+    Intersections of circles with centers a, b and radii ra, rb, broadcast over the leading dimensions,
+    e.g. over pairs of circles and frames of an animation at once
+    :param a: (..., d) centers
+    :param b: (..., d) centers
+    :param ra: scalar or (...) radii
+    :param rb: scalar or (...) radii
+    :return: (..., 2, d) intersections, the first one is on the left of the direction from a to b;
+             NaN for circles which don't intersect, tangent circles give two equal points
+    """
+    a = np.asarray(a, dtype=float)
+    b = np.asarray(b, dtype=float)
+    ra = np.asarray(ra, dtype=float)
+    rb = np.asarray(rb, dtype=float)
+
+    ab = b[..., :2] - a[..., :2]
+    d2 = np.einsum("...i,...i->...", ab, ab)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        d = np.sqrt(d2)
+        miss = (d > ra + rb) | (d < np.abs(ra - rb)) | (d2 == 0)
+        # distance from a to the chord along ab and the half length of the chord
+        l = (ra ** 2 - rb ** 2 + d2) / (2 * d)
+        h = np.sqrt(np.maximum(ra ** 2 - l ** 2, 0))
+        u = ab / d[..., np.newaxis]
+    u = np.where(miss[..., np.newaxis], np.nan, u)
+
+    mid = a[..., :2] + l[..., np.newaxis] * u
+    normal = np.stack((-u[..., 1], u[..., 0]), axis=-1) * h[..., np.newaxis]
+
+    shape = np.broadcast_shapes(a.shape[:-1], b.shape[:-1], ra.shape, rb.shape)
+    result = np.zeros(shape + (2, max(a.shape[-1], b.shape[-1])))
+    result[..., 0, :2] = mid + normal
+    result[..., 1, :2] = mid - normal
+    result[miss] = np.nan
+    return result
+
+
+def find_circles_intersection(a: Point, b: Point, r: float) -> List[Point]:
+    intersections = circles_intersections((a.x, a.y), (b.x, b.y), r, r)
+    if np.isnan(intersections).any():
+        return []
+    return [Point(*p) for p in intersections.tolist()]
@@ -17,8 +17,12 @@ Scenario:
     - stop, wait & fade out
 """
 
+import argparse
+
 import numpy as np
+from lagrangian_mechanics.scenario import SectionedScenario, RenderPlan
 from lagrangian_mechanics.solver.ode_solver import solve, integrate_rk4
+from primitives import cached_math_tex, cached_text
 from manim import *
 
 config.frame_size = (1080, 1080)
@@ -37,9 +41,12 @@ theta = -PI / 6  # pendulum angle
 omega = 0  # pendulum angular velocity
 
 
+G_L = g / L
+
+
 def derivatives(state, step, t, dt):
     [_th, _w] = state
-    return [_w, - g / L * np.sin(_th)]
+    return [_w, - G_L * np.sin(_th)]
 
 
 solution = solve(
@@ -114,10 +121,17 @@ class SimplePendulum:
         ])
 
 
-class Scenario(MovingCameraScene):
+class Scenario(SectionedScenario):
+    SECTIONS = [
+        "play_intro",
+        "play_draw_main_scene",
+        "play_draw_equations",
+        "animate_pendulum",
+        "play_outro"
+    ]
 
-    def __init__(self):
-        super().__init__()
+    def __init__(self, plan: RenderPlan = None):
+        super().__init__(plan)
         self.pendulum = SimplePendulum()
 
     def play_intro(self):
@@ -162,6 +176,7 @@ class Scenario(MovingCameraScene):
         text_2 = Text("Simple\npendulum", **secondary_font).next_to(line_sep, direction=RIGHT)
         self.play(Write(text_2))
         self.wait(3)
+        self.fade_out_all()
 
     def play_draw_main_scene(self):
         p = self.pendulum
@@ -209,67 +224,67 @@ class Scenario(MovingCameraScene):
             "color": BLUE_B
         }
 
-        text_title = Text("Derivation of the equation of motion", **comment_font) \
+        text_title = cached_text("Derivation of the equation of motion", **comment_font) \
             .shift(6 * UP + 4 * LEFT)
         self.play(Write(text_title), run_time=1)
 
-        text_comment1 = Text("1. Lagrangian:", **comment_font) \
+        text_comment1 = cached_text("1. Lagrangian:", **comment_font) \
             .next_to(text_title, 2 * DOWN) \
             .align_to(text_title, LEFT)
         self.play(Write(text_comment1), run_time=1)
-        text_lagrangian = MathTex(r"\mathcal{L} = T - V", **math_font).next_to(text_comment1, RIGHT)
+        text_lagrangian = cached_math_tex(r"\mathcal{L} = T - V", **math_font).next_to(text_comment1, RIGHT)
         self.play(Write(text_lagrangian), run_time=1)
 
-        text_t = MathTex(r"T = m\frac{(\dot{\theta}l)^2}{2},\;kinetic\;energy", **math_font) \
+        text_t = cached_math_tex(r"T = m\frac{(\dot{\theta}l)^2}{2},\;kinetic\;energy", **math_font) \
             .next_to(text_lagrangian, DOWN) \
             .align_to(text_comment1, LEFT)
         self.play(Write(text_t), run_time=1)
 
-        text_v = MathTex(r"V = mgl(1 - cos\theta),\;potential\;energy", **math_font) \
+        text_v = cached_math_tex(r"V = mgl(1 - cos\theta),\;potential\;energy", **math_font) \
             .next_to(text_t, DOWN) \
             .align_to(text_t, LEFT)
         self.play(Write(text_v), run_time=1)
 
         self.wait(3)
 
-        text_comment2 = Text("2. Plugging into the Lagrange's equation:", **comment_font) \
+        text_comment2 = cached_text("2. Plugging into the Lagrange's equation:", **comment_font) \
             .next_to(text_v, 2 * DOWN) \
             .align_to(text_v, LEFT)
         self.play(Write(text_comment2), run_time=1)
 
         LE_LaTeX = \
             r"\frac{d}{dt}\left(\frac{\partial \mathcal{L}}{\partial\dot{\theta}}\right)-\frac{\partial \mathcal{L}}{\partial\theta}=0"
-        text_le = MathTex(LE_LaTeX, **math_font) \
+        text_le = cached_math_tex(LE_LaTeX, **math_font) \
             .next_to(text_comment2, DOWN) \
             .align_to(text_comment2, LEFT)
         self.play(Write(text_le), run_time=1)
 
-        text_le_1 = MathTex(r"\frac{\partial \mathcal{L}}{\partial\dot{\theta}}=ml^2\dot\theta^2", **math_font) \
+        text_le_1 = cached_math_tex(r"\frac{\partial \mathcal{L}}{\partial\dot{\theta}}=ml^2\dot\theta^2", **math_font) \
             .next_to(text_le, DOWN) \
             .align_to(text_le, LEFT)
         self.play(Write(text_le_1), run_time=1)
 
-        text_le_2 = MathTex(
+        text_le_2 = cached_math_tex(
             r"\frac{d}{dt}\left(\frac{\partial \mathcal{L}}{\partial\dot{\theta}}\right)=ml^2\ddot\theta", **math_font) \
             .next_to(text_le_1, DOWN) \
             .align_to(text_le_1, LEFT)
         self.play(Write(text_le_2), run_time=1)
 
-        text_le_3 = MathTex(r"\frac{\partial \mathcal{L}}{\partial\theta}=-mglsin\theta", **math_font) \
+        text_le_3 = cached_math_tex(r"\frac{\partial \mathcal{L}}{\partial\theta}=-mglsin\theta", **math_font) \
             .next_to(text_le_2, DOWN) \
             .align_to(text_le_2, LEFT)
         self.play(Write(text_le_3), run_time=1)
 
         self.wait(2)
 
-        text_le_4 = MathTex(r"ml^2\ddot\theta+mglsin\theta=0", **math_font) \
+        text_le_4 = cached_math_tex(r"ml^2\ddot\theta+mglsin\theta=0", **math_font) \
             .next_to(text_le_3, 2 * DOWN) \
             .align_to(text_le_3, LEFT)
         self.play(Write(text_le_4), run_time=1)
 
         self.wait(1)
 
-        text_final_eq = MathTex(r"\ddot\theta+\frac{g}{l}sin\theta=0", **math_font_large) \
+        text_final_eq = cached_math_tex(r"\ddot\theta+\frac{g}{l}sin\theta=0", **math_font_large) \
             .next_to(text_le_3, 2 * DOWN) \
             .align_to(text_le_3, LEFT)
 
@@ -282,7 +297,8 @@ class Scenario(MovingCameraScene):
     def animate_pendulum(self):
         self.play(FadeOut(self.pendulum.g_symbols), run_time=0.5)
 
-        time = ValueTracker(0)
+        t_start, t_end = self.get_time_range(SIMULATION_TIME)
+        time = ValueTracker(t_start)
 
         ox, oy, _ = self.pendulum.g_rod.get_start()
 
@@ -306,23 +322,35 @@ class Scenario(MovingCameraScene):
         self.pendulum.g_rod.add_updater(rod_updater)
         self.pendulum.g_angle_arc.add_updater(arc_updater)
 
-        self.play(time.animate.set_value(SIMULATION_TIME),
-                  run_time=SIMULATION_TIME,
+        self.play(time.animate.set_value(t_end),
+                  run_time=t_end - t_start,
                   rate_func=rate_functions.linear)
 
+    def play_outro(self):
+        self.wait(5)
+
     def fade_out_all(self):
         self.play(*[FadeOut(obj) for obj in self.mobjects])
 
-    def construct(self):
-        self.play_intro()
-        self.fade_out_all()
-        self.play_draw_main_scene()
-        self.play_draw_equations()
-        self.animate_pendulum()
-        self.wait(5)
-
 
 if __name__ == "__main__":
-    scene = Scenario()
+    parser = argparse.ArgumentParser(description="Renders the simple pendulum video")
+    parser.add_argument("--sections", nargs="+", choices=Scenario.SECTIONS,
+                        help="re-render these sections, the rest are taken from the checkpoint")
+    parser.add_argument("--from-time", type=float, default=0,
+                        help="start of the simulation time range to render, seconds")
+    parser.add_argument("--to-time", type=float, default=None,
+                        help="end of the simulation time range to render, seconds")
+    parser.add_argument("--resume", action="store_true",
+                        help="reuse sections completed by the previous render")
+    args = parser.parse_args()
+
+    plan = RenderPlan(
+        sections=args.sections,
+        t_start=args.from_time,
+        t_end=args.to_time,
+        resume=args.resume,
+        signature=f"{L}|{theta}|{SIMULATION_TIME}|{N_STEPS}")
+    scene = Scenario(plan)
 
     scene.render()
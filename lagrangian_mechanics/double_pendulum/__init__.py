@@ -0,0 +1,3 @@
+from lagrangian_mechanics.double_pendulum.params import ModelParams, SIMULATION_TIME, N_STEPS, TRAIL_LENGTH
+from lagrangian_mechanics.double_pendulum.simulation import Simulation
+from lagrangian_mechanics.double_pendulum.geometry import Geometry
\ No newline at end of file
@@ -0,0 +1,57 @@
+from manim import *
+from primitives import FadingTrail
+from lagrangian_mechanics.double_pendulum import Simulation, SIMULATION_TIME, TRAIL_LENGTH
+
+
+primary_params = {
+    "stroke_color": GREEN_B,
+    "fill_opacity": 1,
+    "fill_color": GREEN_B
+}
+
+
+class Geometry:
+    def __init__(self, model: Simulation, origin: np.ndarray = np.array((0, 1.5, 0))):
+        self.model = model
+        model.solve_model()
+
+        self.time = ValueTracker(0)
+        self.origin = origin
+
+        p1 = origin + model.points1[0]
+        p2 = origin + model.points2[0]
+
+        self.ceiling = Line(start=origin + 0.5 * LEFT, end=origin + 0.5 * RIGHT, **primary_params)
+        self.rod1 = Line(start=origin, end=p1, **primary_params)
+        self.rod2 = Line(start=p1, end=p2, **primary_params)
+        self.mass1 = Circle(radius=0.15, **primary_params).move_to(p1)
+        self.mass2 = Circle(radius=0.15, **primary_params).move_to(p2)
+        self.trail = FadingTrail(length=TRAIL_LENGTH, n_bands=24, color=YELLOW, stroke_width=2)
+
+        self.moving_objects = VGroup(
+            self.trail,
+            self.rod1,
+            self.rod2,
+            self.mass1,
+            self.mass2)
+
+    def _updater(self, _: VGroup) -> None:
+        step = self.model.get_step(self.time.get_value())
+        p1 = self.origin + self.model.points1[step]
+        p2 = self.origin + self.model.points2[step]
+
+        self.rod1.put_start_and_end_on(self.origin, p1)
+        self.rod2.put_start_and_end_on(p1, p2)
+        self.mass1.move_to(p1)
+        self.mass2.move_to(p2)
+        self.trail.push(p2)
+
+    def animate(self, scene: Scene, t_start: float = 0, t_end: float = SIMULATION_TIME):
+        self.time.set_value(t_start)
+        self.trail.reset()
+        self.moving_objects.add_updater(self._updater)
+
+        scene.play(self.time.animate.set_value(t_end),
+                   run_time=t_end - t_start,
+                   rate_func=rate_functions.linear)
+        self.moving_objects.remove_updater(self._updater)
@@ -0,0 +1,101 @@
+"""
+Lagrangian mechanics simulation: a double pendulum with friction
+
+Two masses (m1, m2) are attached to weightless rods of lengths (l1, l2),
+the second rod hangs from the first mass, joints have linear friction (b).
+The trajectory of the second mass is drawn as a fading trail.
+
+Scenario:
+  [intro]
+    - fade in: 'Lagrangian mechanics'
+    - vertical line
+    - write: double pendulum
+  [scene]
+    - fade in: double pendulum
+    - animate the pendulum with a fading trail
+    - pause
+"""
+import argparse
+import logging
+
+from lagrangian_mechanics.scenario import SectionedScenario, RenderPlan
+from lagrangian_mechanics.double_pendulum import ModelParams, Simulation, Geometry, SIMULATION_TIME, N_STEPS
+from manim import *
+
+
+logging.basicConfig(format='%(asctime)s %(message)s', level=logging.INFO)
+
+config.frame_size = (1080, 1080)
+
+
+class Scenario(SectionedScenario):
+    SECTIONS = [
+        "play_intro",
+        "play_draw_main_scene",
+        "animate_pendulum",
+        "play_outro"
+    ]
+
+    def __init__(self, plan: RenderPlan = None):
+        super().__init__(plan)
+        self.model = Simulation(ModelParams())
+        self.geometry = Geometry(self.model)
+
+    def play_intro(self):
+        primary_font = {
+            "font_size": 36,
+            "color": GREEN_B
+        }
+
+        secondary_font = {
+            "font_size": 36,
+            "color": BLUE_A
+        }
+
+        text_1 = Text("Lagrangian\nmechanics", **primary_font).shift(2 * LEFT)
+        self.play(FadeIn(text_1))
+
+        line_sep = Line(start=(0, 1, 0), end=(0, -1, 0)).next_to(text_1)
+        self.play(Create(line_sep))
+
+        text_2 = Text("Double\npendulum", **secondary_font).next_to(line_sep, direction=RIGHT)
+        self.play(Write(text_2))
+        self.wait(1.5)
+        self.fade_out_all()
+
+    def play_draw_main_scene(self):
+        self.play(FadeIn(self.geometry.ceiling, self.geometry.moving_objects))
+        self.wait(1)
+
+    def animate_pendulum(self):
+        self.geometry.animate(self, *self.get_time_range(SIMULATION_TIME))
+
+    def play_outro(self):
+        self.wait(3)
+        self.fade_out_all()
+
+    def fade_out_all(self):
+        self.play(*[FadeOut(obj) for obj in self.mobjects])
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Renders the double pendulum video")
+    parser.add_argument("--sections", nargs="+", choices=Scenario.SECTIONS,
+                        help="re-render these sections, the rest are taken from the checkpoint")
+    parser.add_argument("--from-time", type=float, default=0,
+                        help="start of the simulation time range to render, seconds")
+    parser.add_argument("--to-time", type=float, default=None,
+                        help="end of the simulation time range to render, seconds")
+    parser.add_argument("--resume", action="store_true",
+                        help="reuse sections completed by the previous render")
+    args = parser.parse_args()
+
+    plan = RenderPlan(
+        sections=args.sections,
+        t_start=args.from_time,
+        t_end=args.to_time,
+        resume=args.resume,
+        signature=f"{ModelParams()}|{SIMULATION_TIME}|{N_STEPS}")
+    scene = Scenario(plan)
+
+    scene.render()
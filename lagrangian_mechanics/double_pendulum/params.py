@@ -0,0 +1,17 @@
+from dataclasses import dataclass
+
+g = 9.81
+
+N_STEPS = 15000
+SIMULATION_TIME = 30
+
+TRAIL_LENGTH = 240
+
+
+@dataclass
+class ModelParams:
+    l1: float = 2
+    l2: float = 2
+    m1: float = 1
+    m2: float = 1
+    b: float = 0.2  # damping torque per angular velocity of a joint
@@ -0,0 +1,61 @@
+import logging
+import numpy as np
+import sympy as sp
+from numpy import pi as PI, sin, cos
+from lagrangian_mechanics.double_pendulum.params import ModelParams, N_STEPS, SIMULATION_TIME, g
+from lagrangian_mechanics.solver.ode_solver import solve, integrate_rk4
+from lagrangian_mechanics.solver.lagrangian import LagrangianSystem
+
+_th1, _th2, _w1, _w2 = sp.symbols("theta1 theta2 omega1 omega2")
+_l1, _l2, _m1, _m2, _b, _g = sp.symbols("l1 l2 m1 m2 b g")
+
+# angles of the rods from the vertical, the joints damp the relative rotation of what they connect
+SYSTEM = LagrangianSystem(
+    q=[_th1, _th2], dq=[_w1, _w2],
+    T=_m1 * (_l1 * _w1) ** 2 / 2
+    + _m2 * ((_l1 * _w1) ** 2 + (_l2 * _w2) ** 2 + 2 * _l1 * _l2 * _w1 * _w2 * sp.cos(_th1 - _th2)) / 2,
+    V=-(_m1 + _m2) * _g * _l1 * sp.cos(_th1) - _m2 * _g * _l2 * sp.cos(_th2),
+    D=_b * (_w1 ** 2 + (_w2 - _w1) ** 2) / 2)
+
+
+class Simulation:
+    def __init__(self, params: ModelParams, initial_th1: float = 3 * PI / 4, initial_th2: float = PI / 2):
+        self.params = params
+        self.initial_th1 = initial_th1
+        self.initial_th2 = initial_th2
+
+        self.times = np.linspace(0, SIMULATION_TIME, N_STEPS)
+        self.dt = self.times[1] - self.times[0]
+        self.solution = []
+        self.thetas1 = []
+        self.thetas2 = []
+        self.points1 = []
+        self.points2 = []
+
+    def _get_derivatives(self):
+        p = self.params
+        return SYSTEM.compile({_l1: p.l1, _l2: p.l2, _m1: p.m1, _m2: p.m2, _b: p.b, _g: g})
+
+    def solve_model(self):
+        logging.info("Solving equations...")
+        self.solution = solve(
+            np.array([self.initial_th1, self.initial_th2, 0, 0]),
+            self.times,
+            integrate_rk4,
+            self._get_derivatives()
+        )
+        logging.info(f"Solved: {len(self.solution)} steps")
+
+        l1, l2 = self.params.l1, self.params.l2
+        self.thetas1 = self.solution[:, 0]
+        self.thetas2 = self.solution[:, 1]
+
+        zeros = np.zeros_like(self.thetas1)
+        self.points1 = np.stack((l1 * sin(self.thetas1), -l1 * cos(self.thetas1), zeros), axis=1)
+        self.points2 = self.points1 + np.stack((l2 * sin(self.thetas2), -l2 * cos(self.thetas2), zeros), axis=1)
+
+    def get_step(self, t: float) -> int:
+        """
+        :return: index of the state at the time t
+        """
+        return min(int(t / self.dt), len(self.solution) - 1)
@@ -0,0 +1,53 @@
+"""
+Holding plasma with a magnetic field: charged particles trapped in a magnetic bottle
+
+The bottle axis (z) is drawn horizontally, particles are projected on the z-x plane
+and colored by their kinetic energy.
+"""
+import numpy as np
+from lagrangian_mechanics.particles import ParticleEnsemble, MagneticBottle
+from primitives import ParticleCloud
+from manim import *
+
+N_PARTICLES = 20000
+PROCESSES = 4
+STEPS_PER_FRAME = 8
+SIMULATION_TIME = 20
+
+B0 = 1.0
+BOTTLE_LENGTH = 1.0
+Q_M = 20.0
+SCALE = 3.0
+
+
+class Scenario(Scene):
+    def construct(self):
+        rng = np.random.default_rng(42)
+        positions = rng.normal(0, [0.1, 0.1, 0.3], (N_PARTICLES, 3))
+        velocities = rng.normal(0, 1, (N_PARTICLES, 3))
+
+        with ParticleEnsemble(positions, velocities, Q_M, b_field=MagneticBottle(B0, BOTTLE_LENGTH),
+                              processes=PROCESSES) as ensemble:
+            projected = np.zeros((N_PARTICLES, 3))
+
+            def project(x: np.ndarray) -> np.ndarray:
+                projected[:, 0] = x[:, 2] * SCALE
+                projected[:, 1] = x[:, 0] * SCALE
+                return projected
+
+            cloud = ParticleCloud(project(ensemble.x.T), stroke_width=1)
+            cloud.set_colors_by_values(ensemble.kinetic_energy(), BLUE, YELLOW, opacity=0.6)
+
+            frame_time = 1 / config.frame_rate
+            frames = ensemble.frames(int(SIMULATION_TIME * config.frame_rate) + 1, frame_time, STEPS_PER_FRAME)
+            next(frames)
+
+            def update_cloud(mob, dt):
+                x = next(frames, None) if dt > 0 else None
+                if x is not None:
+                    mob.set_positions(project(x))
+
+            self.add(cloud)
+            cloud.add_updater(update_cloud)
+            self.wait(SIMULATION_TIME)
+            cloud.clear_updaters()
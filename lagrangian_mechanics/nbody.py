@@ -0,0 +1,202 @@
+"""
+N-body gravity for the 3 body problem (Jupiter & Sun) and star-field effects.
+
+Bodies are integrated with ode_solver.solve() and a symplectic integrator (leapfrog by default);
+the state is flat [positions..., velocities...] of N bodies in `dim` dimensions.
+Accelerations are computed either exactly from all pairwise forces (O(N^2), broadcasted,
+work buffers allocated once) or with the Barnes-Hut approximation (O(N log N)) for N in thousands.
+"""
+from typing import Optional, Tuple
+
+import numpy as np
+from lagrangian_mechanics.solver.cache import cached_solve
+from lagrangian_mechanics.solver.ode_solver import solve, integrate_leapfrog
+
+
+class PairwiseGravity:
+    def __init__(self, masses: np.ndarray, G: float = 1.0, softening: float = 0.0, dim: int = 2):
+        n = len(masses)
+        self.gm = G * np.asarray(masses, dtype=float)
+        self.softening2 = softening ** 2
+        self.diff = np.empty((n, n, dim))
+        self.r = np.empty((n, n))
+        self.acc = np.empty((n, dim))
+
+    def accelerations(self, positions: np.ndarray) -> np.ndarray:
+        """
+        :param positions: (n, dim) array
+        :return: (n, dim) array, owned by this object and overwritten on the next call
+        """
+        # diff[i, j] = x_j - x_i
+        np.subtract(positions[np.newaxis, :, :], positions[:, np.newaxis, :], out=self.diff)
+        np.einsum("ijk,ijk->ij", self.diff, self.diff, out=self.r)
+        self.r += self.softening2
+        np.fill_diagonal(self.r, 1.0)
+        np.power(self.r, -1.5, out=self.r)
+        self.r *= self.gm[np.newaxis, :]
+        np.einsum("ijk,ij->ik", self.diff, self.r, out=self.acc)
+        return self.acc
+
+
+class BarnesHutGravity:
+    """
+    Barnes-Hut approximation over a tree of Morton-ordered cells. The tree is built and traversed
+    level by level with array operations: all bodies descend simultaneously, a cell is accepted
+    when size / distance < theta.
+    """
+    MAX_DEPTH = 16
+
+    def __init__(self, masses: np.ndarray, G: float = 1.0, softening: float = 0.0, dim: int = 2,
+                 theta: float = 0.5):
+        if dim * self.MAX_DEPTH > 62:
+            raise ValueError(f"Unsupported dimension: {dim}")
+        self.masses = np.asarray(masses, dtype=float)
+        self.G = G
+        self.softening2 = softening ** 2
+        self.dim = dim
+        self.theta2 = theta ** 2
+
+    def _get_codes(self, positions: np.ndarray) -> Tuple[np.ndarray, float]:
+        low = positions.min(axis=0)
+        side = (positions.max(axis=0) - low).max() * (1 + 1e-9) or 1.0
+        cells = 1 << self.MAX_DEPTH
+        ix = np.minimum(((positions - low) / side * cells).astype(np.int64), cells - 1)
+
+        codes = np.zeros(len(positions), dtype=np.int64)
+        for bit in range(self.MAX_DEPTH):
+            for k in range(self.dim):
+                codes |= ((ix[:, k] >> bit) & 1) << (bit * self.dim + k)
+        return codes, side
+
+    def _build_levels(self, positions: np.ndarray):
+        codes, side = self._get_codes(positions)
+        order = np.argsort(codes, kind="stable")
+        codes = codes[order]
+        masses = self.masses[order]
+        weighted = positions[order] * masses[:, np.newaxis]
+
+        levels = []
+        for level in range(self.MAX_DEPTH + 1):
+            prefix = codes >> (self.dim * (self.MAX_DEPTH - level))
+            keys, starts, counts = np.unique(prefix, return_index=True, return_counts=True)
+            mass = np.add.reduceat(masses, starts)
+            com = np.add.reduceat(weighted, starts, axis=0) / mass[:, np.newaxis]
+            leaf = (counts == 1) | (level == self.MAX_DEPTH)
+            levels.append({"keys": keys, "mass": mass, "com": com, "leaf": leaf,
+                           "size2": (side / (1 << level)) ** 2})
+            if leaf.all():
+                break
+
+        for parent, child in zip(levels[:-1], levels[1:]):
+            child_parents = child["keys"] >> self.dim
+            parent["child_start"] = np.searchsorted(child_parents, parent["keys"], side="left")
+            parent["child_end"] = np.searchsorted(child_parents, parent["keys"], side="right")
+        return levels
+
+    def accelerations(self, positions: np.ndarray) -> np.ndarray:
+        """
+        :param positions: (n, dim) array
+        :return: (n, dim) array
+        """
+        levels = self._build_levels(positions)
+        acc = np.zeros_like(positions, dtype=float)
+        bodies = np.arange(len(positions))
+        nodes = np.zeros(len(positions), dtype=np.int64)
+
+        for level in levels:
+            if len(bodies) == 0:
+                break
+            d = level["com"][nodes] - positions[bodies]
+            r2 = np.einsum("ij,ij->i", d, d)
+            accept = level["leaf"][nodes] | (level["size2"] < self.theta2 * r2)
+
+            # a leaf at zero distance is the body itself
+            apply = accept & (r2 > 0)
+            inv_r3 = (r2[apply] + self.softening2) ** -1.5
+            np.add.at(acc, bodies[apply], d[apply] * (self.G * level["mass"][nodes[apply]] * inv_r3)[:, np.newaxis])
+
+            parents = nodes[~accept]
+            if len(parents) == 0:
+                break
+            start = level["child_start"][parents]
+            count = level["child_end"][parents] - start
+            offsets = np.arange(count.sum()) - np.repeat(np.cumsum(count) - count, count)
+            bodies = np.repeat(bodies[~accept], count)
+            nodes = np.repeat(start, count) + offsets
+        return acc
+
+
+class NBody:
+    def __init__(self, masses: np.ndarray, G: float = 1.0, softening: float = 0.0, dim: int = 2,
+                 theta: Optional[float] = None):
+        """
+        :param masses: masses of the bodies
+        :param G: gravitational constant in the units of the scene
+        :param softening: softening length, avoids singular forces on close encounters
+        :param dim: 2 or 3
+        :param theta: Barnes-Hut opening angle, exact pairwise forces if None
+        """
+        self.masses = np.asarray(masses, dtype=float)
+        self.n = len(masses)
+        self.dim = dim
+        self.G = G
+        self.softening = softening
+        self.theta = theta
+        if theta is None:
+            self.gravity = PairwiseGravity(self.masses, G, softening, dim)
+        else:
+            self.gravity = BarnesHutGravity(self.masses, G, softening, dim, theta)
+
+    def derivatives(self, state, step, t, dt):
+        state = np.asarray(state, dtype=float)
+        half = self.n * self.dim
+        acc = self.gravity.accelerations(state[:half].reshape(self.n, self.dim))
+        return np.concatenate((state[half:], acc.ravel()))
+
+    def get_initial_state(self, positions: np.ndarray, velocities: np.ndarray) -> np.ndarray:
+        return np.concatenate((np.ravel(positions), np.ravel(velocities))).astype(float)
+
+    def to_center_of_mass_frame(self, positions: np.ndarray, velocities: np.ndarray) -> (np.ndarray, np.ndarray):
+        """
+        Removes the motion of the center of mass, so the system doesn't drift off the screen
+        """
+        weights = self.masses[:, np.newaxis] / self.masses.sum()
+        return positions - (positions * weights).sum(axis=0), velocities - (velocities * weights).sum(axis=0)
+
+    def energy(self, solution: np.ndarray) -> np.ndarray:
+        """
+        Total energy of every state of a solution, exact pairwise sum
+        """
+        half = self.n * self.dim
+        x = solution[:, :half].reshape(-1, self.n, self.dim)
+        v = solution[:, half:].reshape(-1, self.n, self.dim)
+        kinetic = 0.5 * np.einsum("j,ijk,ijk->i", self.masses, v, v)
+        r = np.sqrt(((x[:, :, np.newaxis, :] - x[:, np.newaxis, :, :]) ** 2).sum(axis=-1) + self.softening ** 2)
+        i, j = np.triu_indices(self.n, k=1)
+        potential = -self.G * (self.masses[i] * self.masses[j] / r[:, i, j]).sum(axis=1)
+        return kinetic + potential
+
+    def solve(self, positions: np.ndarray, velocities: np.ndarray, times: np.ndarray,
+              integrate_func=integrate_leapfrog, cache: bool = True) -> np.ndarray:
+        """
+        :param positions: (n, dim) initial positions
+        :param velocities: (n, dim) initial velocities
+        :param times: time points, as for solve()
+        :param integrate_func: symplectic integrators keep the energy bounded on long runs
+        :param cache: load the trajectory from the trajectory cache when available
+        :return: (len(times) + 1, 2 * n * dim) states, see get_positions
+        """
+        initial_state = self.get_initial_state(positions, velocities)
+        if not cache:
+            return solve(initial_state, times, integrate_func, self.derivatives)
+        system_key = repr(("nbody", self.masses.tolist(), self.G, self.softening, self.dim, self.theta))
+        return cached_solve(initial_state, times, integrate_func, self.derivatives, system_key)
+
+    def get_positions(self, solution: np.ndarray) -> np.ndarray:
+        """
+        :return: (steps, n, dim) view of the positions
+        """
+        return solution[:, :self.n * self.dim].reshape(-1, self.n, self.dim)
+
+    def get_velocities(self, solution: np.ndarray) -> np.ndarray:
+        return solution[:, self.n * self.dim:].reshape(-1, self.n, self.dim)
@@ -0,0 +1,182 @@
+"""
+Charged particles in electric and magnetic fields for the "Holding plasma with a magnetic field" video.
+
+Particles don't interact, every particle is advanced by the Boris scheme:
+    v- = v + (q/m) E dt/2
+    v+ = v- rotated around B by the angle of the gyration over dt
+    v  = v+ + (q/m) E dt/2,   x = x + v dt
+which conserves the kinetic energy in a pure magnetic field and keeps the gyration radius
+on long runs. The ensemble is stored as structure of arrays: rows x, y, z, vx, vy, vz of a
+(6, n) buffer, updated in place. With processes > 1 the buffer is allocated in shared memory
+and chunks of particles are advanced by a process pool.
+
+Fields are callables field(x, t) -> (3, n) array with x a (3, n) array of positions.
+They must be picklable (module level classes or functions) to be used with processes > 1.
+"""
+from multiprocessing import Pool
+from multiprocessing.shared_memory import SharedMemory
+from typing import Callable, Iterator, Optional, Union
+
+import numpy as np
+
+Field = Callable[[np.ndarray, float], np.ndarray]
+
+
+class UniformField:
+    def __init__(self, vector):
+        self.vector = np.asarray(vector, dtype=float).reshape(3, 1)
+
+    def __call__(self, x: np.ndarray, t: float) -> np.ndarray:
+        return np.broadcast_to(self.vector, x.shape)
+
+
+class MagneticBottle:
+    """
+    Axially symmetric mirror field along z, B_z = B0 (1 + z^2 / L^2), with the radial component
+    which keeps the divergence zero to the first order in the distance from the axis.
+    The field is the strongest at z = +-L, where slow particles are reflected.
+    """
+
+    def __init__(self, B0: float = 1.0, L: float = 1.0):
+        self.B0 = B0
+        self.inv_L2 = 1 / L ** 2
+
+    def __call__(self, x: np.ndarray, t: float) -> np.ndarray:
+        b = np.empty_like(x)
+        k = -self.B0 * self.inv_L2 * x[2]
+        np.multiply(k, x[0], out=b[0])
+        np.multiply(k, x[1], out=b[1])
+        np.multiply(self.B0 * self.inv_L2 * x[2], x[2], out=b[2])
+        b[2] += self.B0
+        return b
+
+
+def zero_field(x: np.ndarray, t: float) -> np.ndarray:
+    return np.zeros_like(x)
+
+
+def boris_push(x: np.ndarray, v: np.ndarray, q_m: Union[float, np.ndarray], t: float, dt: float,
+               e_field: Field, b_field: Field) -> None:
+    """
+    Advances positions and velocities by one step in place
+    :param x: (3, n) positions
+    :param v: (3, n) velocities
+    :param q_m: charge to mass ratio, scalar or (n,) array
+    """
+    half = 0.5 * q_m * dt
+    e = half * e_field(x, t)
+    v += e
+
+    tau = half * b_field(x, t)
+    s = 2 * tau / (1 + np.einsum("ij,ij->j", tau, tau))
+    v_prime = v + np.cross(v, tau, axis=0)
+    v += np.cross(v_prime, s, axis=0)
+
+    v += e
+    x += v * dt
+
+
+def _advance(x, v, q_m, t, dt, n_steps, e_field, b_field):
+    for step in range(n_steps):
+        boris_push(x, v, q_m, t + step * dt, dt, e_field, b_field)
+
+
+def _advance_chunk(shm_name: str, n: int, start: int, end: int, q_m, t, dt, n_steps, e_field, b_field):
+    shm = SharedMemory(name=shm_name)
+    try:
+        state = np.ndarray((6, n), dtype=float, buffer=shm.buf)
+        # a contiguous copy of the chunk is faster to update than strided views of the shared buffer
+        chunk = state[:, start:end].copy()
+        _advance(chunk[:3], chunk[3:], q_m, t, dt, n_steps, e_field, b_field)
+        state[:, start:end] = chunk
+        del state
+    finally:
+        shm.close()
+
+
+class ParticleEnsemble:
+    def __init__(self,
+                 positions: np.ndarray,
+                 velocities: np.ndarray,
+                 q_m: Union[float, np.ndarray] = 1.0,
+                 e_field: Field = zero_field,
+                 b_field: Field = zero_field,
+                 processes: int = 1):
+        """
+        :param positions: (n, 3) initial positions
+        :param velocities: (n, 3) initial velocities
+        :param q_m: charge to mass ratio, scalar or per particle
+        :param processes: number of worker processes, particles are split into equal chunks
+        """
+        self.n = len(positions)
+        self.q_m = q_m if np.isscalar(q_m) else np.asarray(q_m, dtype=float)
+        self.e_field = e_field
+        self.b_field = b_field
+        self.processes = processes
+        self.t = 0.0
+
+        self._shm: Optional[SharedMemory] = None
+        self._pool = None
+        if processes > 1:
+            self._shm = SharedMemory(create=True, size=6 * self.n * np.dtype(float).itemsize)
+            self.state = np.ndarray((6, self.n), dtype=float, buffer=self._shm.buf)
+            self._pool = Pool(processes)
+        else:
+            self.state = np.empty((6, self.n))
+
+        self.state[:3] = np.asarray(positions, dtype=float).T
+        self.state[3:] = np.asarray(velocities, dtype=float).T
+        self.x = self.state[:3]
+        self.v = self.state[3:]
+
+    def advance(self, dt: float, n_steps: int = 1) -> "ParticleEnsemble":
+        if self._pool is None:
+            _advance(self.x, self.v, self.q_m, self.t, dt, n_steps, self.e_field, self.b_field)
+        else:
+            bounds = np.linspace(0, self.n, self.processes + 1).astype(int)
+            self._pool.starmap(_advance_chunk, [
+                (self._shm.name, self.n, start, end, self._get_q_m(start, end),
+                 self.t, dt, n_steps, self.e_field, self.b_field)
+                for start, end in zip(bounds[:-1], bounds[1:]) if end > start
+            ])
+        self.t += n_steps * dt
+        return self
+
+    def frames(self, n_frames: int, frame_time: float, steps_per_frame: int = 1) -> Iterator[np.ndarray]:
+        """
+        Yields (n, 3) positions for every frame of the video, starting with the initial ones.
+        The yielded array is a view of the ensemble and changes on the next frame.
+        """
+        dt = frame_time / steps_per_frame
+        for frame in range(n_frames):
+            if frame > 0:
+                self.advance(dt, steps_per_frame)
+            yield self.x.T
+
+    def kinetic_energy(self) -> np.ndarray:
+        """
+        Kinetic energy per unit mass of every particle
+        """
+        return 0.5 * np.einsum("ij,ij->j", self.v, self.v)
+
+    def close(self) -> None:
+        if self._pool is not None:
+            self._pool.close()
+            self._pool.join()
+            self._pool = None
+        if self._shm is not None:
+            self.state = np.array(self.state)
+            self.x = self.state[:3]
+            self.v = self.state[3:]
+            self._shm.close()
+            self._shm.unlink()
+            self._shm = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def _get_q_m(self, start: int, end: int):
+        return self.q_m if np.isscalar(self.q_m) else self.q_m[start:end]
@@ -0,0 +1,179 @@
+"""
+Plants and controllers for the feedback control videos:
+  - inverted pendulum on a cart, swing-up & hold
+  - reaction wheel pendulum, swing-up & hold & disturbance
+Angles are measured from the upright position, states are [positions..., velocities...].
+
+Tuning of the swing-up gains before rendering:
+    plant = CartPole(CartPoleParams())
+    gain_sets = list(itertools.product([20, 40, 80], [1, 2, 4], [2, 4, 8]))
+    costs = evaluate_gains(plant, CartPoleSwingUp(plant.params), gain_sets, [0, PI, 0, 0], times,
+                           QuadraticCost(np.diag([1, 10, 0.1, 0.1]), [[0.01]], angles=[1]), sample_time=0.01)
+    gains, cost = best_gains(gain_sets, costs)
+"""
+from dataclasses import dataclass
+from typing import Optional, Sequence
+
+import numpy as np
+from numpy import sin, cos
+from lagrangian_mechanics.solver.control import Controller, LinearFeedback, SwitchingController, linearize, lqr, \
+    wrap_angle
+
+g = 9.81
+
+
+@dataclass
+class CartPoleParams:
+    M: float = 1.0  # mass of the cart
+    m: float = 0.2  # mass of the bob
+    l: float = 0.5  # length of the rod
+    b: float = 0.1  # friction of the cart
+
+
+@dataclass
+class ReactionWheelParams:
+    m: float = 1.0  # mass of the pendulum with the wheel
+    l: float = 0.3  # distance from the pivot to the center of mass
+    J: float = 0.1  # moment of inertia of the pendulum with the wheel about the pivot
+    I_w: float = 0.01  # moment of inertia of the wheel
+    b: float = 0.01  # friction in the pivot
+
+
+class CartPole:
+    """
+    State [x, theta, dx, dtheta], control: horizontal force applied to the cart
+    """
+
+    def __init__(self, params: CartPoleParams):
+        self.params = params
+
+    def __call__(self, state, u, t):
+        M, m, l, b = self.params.M, self.params.m, self.params.l, self.params.b
+        _, th, dx, w = state
+        s, c = sin(th), cos(th)
+        ddx = (u[0] - b * dx - m * g * s * c + m * l * w ** 2 * s) / (M + m * s ** 2)
+        return [dx, w, ddx, (g * s - ddx * c) / l]
+
+    def force_for_acceleration(self, state, a):
+        """
+        Force which gives the cart acceleration `a` in the given state
+        """
+        M, m, l, b = self.params.M, self.params.m, self.params.l, self.params.b
+        _, th, dx, w = state
+        s, c = sin(th), cos(th)
+        return (M + m * s ** 2) * a + b * dx + m * g * s * c - m * l * w ** 2 * s
+
+    def energy(self, state):
+        """
+        Energy of the pendulum relative to the upright position at rest
+        """
+        m, l = self.params.m, self.params.l
+        th, w = state[1], state[3]
+        return 0.5 * m * l ** 2 * w ** 2 + m * g * l * (cos(th) - 1)
+
+
+class ReactionWheelPendulum:
+    """
+    State [theta, phi, dtheta, dphi], phi is the angle of the wheel relative to the pendulum,
+    control: motor torque between the pendulum and the wheel
+    """
+
+    def __init__(self, params: ReactionWheelParams, disturbance=None):
+        """
+        :param disturbance: optional external torque disturbance(t) applied to the pendulum
+        """
+        self.params = params
+        self.disturbance = disturbance
+
+    def __call__(self, state, u, t):
+        m, l, J, I_w, b = self.params.m, self.params.l, self.params.J, self.params.I_w, self.params.b
+        th, _, w, dphi = state
+        torque = 0 if self.disturbance is None else self.disturbance(t)
+        ddth = (m * g * l * sin(th) - b * w - u[0] + torque) / J
+        return [w, dphi, ddth, u[0] / I_w - ddth]
+
+    def energy(self, state):
+        m, l, J = self.params.m, self.params.l, self.params.J
+        th, w = state[0], state[2]
+        return 0.5 * J * w ** 2 + m * g * l * (cos(th) - 1)
+
+
+class CartPoleEnergyControl(Controller):
+    """
+    Pumps energy into the pendulum until it reaches the upright position (Astrom & Furuta),
+    the cart is pulled back to the origin by a PD term
+    """
+
+    def __init__(self, plant: CartPole, k_energy: float, k_x: float, k_v: float, a_max: float = 20):
+        self.plant = plant
+        self.k_energy = k_energy
+        self.k_x = k_x
+        self.k_v = k_v
+        self.a_max = a_max
+
+    def __call__(self, t, state):
+        x, th, dx, w = state
+        a = self.k_energy * self.plant.energy(state) * w * cos(th) - self.k_x * x - self.k_v * dx
+        return [self.plant.force_for_acceleration(state, np.clip(a, -self.a_max, self.a_max))]
+
+
+class ReactionWheelEnergyControl(Controller):
+    def __init__(self, plant: ReactionWheelPendulum, k_energy: float, k_wheel: float, u_max: float):
+        self.plant = plant
+        self.k_energy = k_energy
+        self.k_wheel = k_wheel
+        self.u_max = u_max
+
+    def __call__(self, t, state):
+        u = self.k_energy * self.plant.energy(state) * state[2] + self.k_wheel * state[3]
+        return [np.clip(u, -self.u_max, self.u_max)]
+
+
+class _IsUpright:
+    def __init__(self, angle: int, capture_angle: float):
+        self.angle = angle
+        self.capture_angle = capture_angle
+
+    def __call__(self, state) -> bool:
+        return abs(wrap_angle(state[self.angle])) < self.capture_angle
+
+
+class CartPoleSwingUp:
+    """
+    Factory of the swing-up & LQR hold controller from the gains (k_energy, k_x, k_v),
+    picklable to be used with evaluate_gains
+    """
+
+    def __init__(self, params: CartPoleParams, u_max: float = 20, capture_angle: float = 0.3,
+                 Q: Optional[np.ndarray] = None, R: Optional[np.ndarray] = None):
+        self.plant = CartPole(params)
+        self.u_max = u_max
+        self.capture_angle = capture_angle
+        A, B = linearize(self.plant, np.zeros(4), [0])
+        self.K = lqr(A, B, np.diag([1, 10, 1, 1]) if Q is None else Q, [[0.1]] if R is None else R)
+
+    def __call__(self, gains: Sequence[float]) -> Controller:
+        return SwitchingController(
+            CartPoleEnergyControl(self.plant, *gains),
+            LinearFeedback(self.K, u_max=self.u_max, angles=[1]),
+            _IsUpright(1, self.capture_angle))
+
+
+class ReactionWheelSwingUp:
+    """
+    Factory of the swing-up & LQR hold controller from the gains (k_energy, k_wheel)
+    """
+
+    def __init__(self, params: ReactionWheelParams, u_max: float = 0.5, capture_angle: float = 0.2,
+                 Q: Optional[np.ndarray] = None, R: Optional[np.ndarray] = None):
+        self.plant = ReactionWheelPendulum(params)
+        self.u_max = u_max
+        self.capture_angle = capture_angle
+        A, B = linearize(self.plant, np.zeros(4), [0])
+        self.K = lqr(A, B, np.diag([10, 0, 1, 0.01]) if Q is None else Q, [[1.0]] if R is None else R)
+
+    def __call__(self, gains: Sequence[float]) -> Controller:
+        return SwitchingController(
+            ReactionWheelEnergyControl(self.plant, *gains, u_max=self.u_max),
+            LinearFeedback(self.K, u_max=self.u_max, angles=[0]),
+            _IsUpright(0, self.capture_angle))
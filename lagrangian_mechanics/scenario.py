@@ -0,0 +1,175 @@
+"""
+Sectioned scenarios for the long physics videos.
+
+A scenario is split into named sections (methods listed in SECTIONS). Each rendered
+section is combined into its own video file and recorded in a checkpoint, so that:
+  - an interrupted render can be resumed from the last completed section
+  - only selected sections (or a time range of the simulation) can be re-rendered
+    while iterating on a part of the video, and combined with the other sections of the checkpoint
+The checkpoint is valid for the parameters of the render and the source of the scenario,
+any edit of the scenario file starts over.
+Sections which are not rendered are still constructed with skipped animations,
+so the state of the scene is always consistent.
+Formulas of the scenario are compiled in parallel before rendering begins.
+"""
+import hashlib
+import inspect
+import json
+import logging
+import subprocess
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List, Optional
+
+from manim import *
+from primitives.tex_precompile import precompile_scenario
+
+
+@dataclass
+class RenderPlan:
+    sections: Optional[List[str]] = None
+    t_start: float = 0
+    t_end: Optional[float] = None
+    resume: bool = False
+    checkpoint_dir: str = "media/checkpoints"
+    signature: str = ""
+
+    def includes(self, section: str) -> bool:
+        return self.sections is None or section in self.sections
+
+    def has_time_range(self) -> bool:
+        return self.t_start > 0 or self.t_end is not None
+
+    def get_time_range(self, duration: float) -> (float, float):
+        t_end = duration if self.t_end is None else min(self.t_end, duration)
+        return min(self.t_start, t_end), t_end
+
+
+def concat_videos(files: List[str], output: Path) -> None:
+    """
+    Concatenates video files without re-encoding, the same way manim combines partial movie files
+    """
+    output.parent.mkdir(parents=True, exist_ok=True)
+    file_list = output.with_suffix(".txt")
+    with file_list.open("w", encoding="utf-8") as fp:
+        for f in files:
+            fp.write(f"file 'file:{Path(f).absolute().as_posix()}'\n")
+    subprocess.run([
+        config.ffmpeg_executable, "-y", "-f", "concat", "-safe", "0", "-i", str(file_list),
+        "-loglevel", config.ffmpeg_loglevel.lower(), "-c", "copy", "-an", "-nostdin", str(output)
+    ], check=True)
+    file_list.unlink()
+
+
+class Checkpoint:
+    """
+    Index of the completed sections of a scenario, stored next to the section videos
+    """
+
+    def __init__(self, directory: Path, signature: str):
+        self.directory = directory
+        self.index_file = directory / "checkpoint.json"
+        self.signature = signature
+        self.sections = {}
+
+        if self.index_file.exists():
+            index = json.loads(self.index_file.read_text())
+            if index.get("signature") == signature:
+                self.sections = index["sections"]
+            else:
+                logging.info(f"Checkpoint {self.index_file} is outdated, starting over")
+
+    def reset(self) -> None:
+        self.sections = {}
+        self._write()
+
+    def invalidate(self, names: List[str]) -> None:
+        for name in names:
+            self.sections.pop(name, None)
+        self._write()
+
+    def is_done(self, name: str) -> bool:
+        if name not in self.sections:
+            return False
+        video = self.sections[name]
+        return video is None or (self.directory / video).exists()
+
+    def save(self, index: int, name: str, partial_movie_files: List[str]) -> None:
+        video = None
+        if len(partial_movie_files) > 0:
+            video = f"{index:02}_{name}{config.movie_file_extension}"
+            concat_videos(partial_movie_files, self.directory / video)
+        self.sections[name] = video
+        self._write()
+        logging.info(f"Section '{name}' is saved to the checkpoint")
+
+    def combine(self, names: List[str], output: Path) -> None:
+        videos = [self.directory / self.sections[name] for name in names if self.sections[name] is not None]
+        concat_videos(videos, output)
+
+    def _write(self) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.index_file.write_text(json.dumps({
+            "signature": self.signature,
+            "sections": self.sections
+        }, indent=2))
+
+
+class SectionedScenario(MovingCameraScene):
+    """
+    Renders the methods listed in SECTIONS one by one as manim sections
+    """
+    SECTIONS: List[str] = []
+
+    def __init__(self, plan: RenderPlan = None, **kwargs):
+        super().__init__(**kwargs)
+        self.plan = plan or RenderPlan()
+        unknown = [s for s in (self.plan.sections or []) if s not in self.SECTIONS]
+        if len(unknown) > 0:
+            raise ValueError(f"Unknown sections: {unknown}, available: {self.SECTIONS}")
+
+        quality = f"{config.pixel_width}x{config.pixel_height}@{config.frame_rate}"
+        source = hashlib.sha256(Path(inspect.getfile(self.__class__)).read_bytes()).hexdigest()[:16]
+        self.checkpoint = Checkpoint(
+            Path(self.plan.checkpoint_dir) / self.__class__.__name__,
+            f"{self.plan.signature}|{quality}|{source}")
+        if self.plan.sections is not None:
+            # a time range is a preview, it doesn't replace the checkpointed section
+            if not self.plan.has_time_range():
+                self.checkpoint.invalidate(self.plan.sections)
+        elif not self.plan.resume:
+            self.checkpoint.reset()
+        self.reused_sections = []
+
+    def get_time_range(self, duration: float) -> (float, float):
+        return self.plan.get_time_range(duration)
+
+    def construct(self):
+        for i, name in enumerate(self.SECTIONS):
+            # sections named explicitly are always rendered, the others are reused when completed
+            requested = self.plan.sections is not None and name in self.plan.sections
+            reuse = not requested and self.checkpoint.is_done(name)
+            render = self.plan.includes(name) and not reuse
+            if reuse:
+                logging.info(f"Section '{name}' is taken from the checkpoint")
+                self.reused_sections.append(name)
+
+            self.next_section(name, skip_animations=not render)
+            getattr(self, name)()
+
+            if render and not self.plan.has_time_range():
+                section = self.renderer.file_writer.sections[-1]
+                self.checkpoint.save(i, name, section.get_clean_partial_movie_files())
+
+    def render(self, preview: bool = False):
+        precompile_scenario(inspect.getfile(self.__class__))
+        super().render(preview)
+        if len(self.reused_sections) == 0 or self.plan.has_time_range():
+            return
+
+        if all(self.checkpoint.is_done(name) for name in self.SECTIONS):
+            output = Path(self.renderer.file_writer.movie_file_path)
+            self.checkpoint.combine(self.SECTIONS, output)
+            logging.info(f"Combined {len(self.SECTIONS)} sections into {output}")
+        else:
+            logging.info("Not all sections are rendered yet, the output video is partial")
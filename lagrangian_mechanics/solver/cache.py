@@ -0,0 +1,44 @@
+"""
+Disk cache of solved trajectories.
+
+A trajectory is stored as a .npy file named by a hash of the initial state, the time grid,
+the integrator and a caller-provided description of the system (parameters, model version),
+so a scene re-rendered with the same setup loads the solution instead of integrating again.
+"""
+import hashlib
+import logging
+import os
+from pathlib import Path
+
+import numpy as np
+from lagrangian_mechanics.solver.ode_solver import solve
+
+CACHE_DIR = Path(os.environ.get(
+    "INNER_NERD_TRAJECTORY_CACHE", Path.home() / ".cache" / "inner-nerd" / "trajectories"))
+
+
+def get_key(initial_state, times, integrate_func, system_key: str) -> str:
+    hasher = hashlib.sha256()
+    hasher.update(system_key.encode())
+    hasher.update(integrate_func.__name__.encode())
+    hasher.update(np.ascontiguousarray(initial_state, dtype=float).tobytes())
+    hasher.update(np.array([times[0], times[-1], len(times)], dtype=float).tobytes())
+    return hasher.hexdigest()[:16]
+
+
+def cached_solve(initial_state, times, integrate_func, derivative_func, system_key: str) -> np.ndarray:
+    """
+    Same as solve(), the result is taken from the cache when possible
+    :param system_key: describes everything the derivative function depends on, e.g. repr of the parameters
+    """
+    path = CACHE_DIR / f"{get_key(initial_state, times, integrate_func, system_key)}.npy"
+    if path.exists():
+        logging.info(f"Loading cached trajectory {path}")
+        return np.load(path)
+
+    solution = solve(initial_state, times, integrate_func, derivative_func)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(f".{os.getpid()}.tmp.npy")
+    np.save(tmp, solution)
+    tmp.replace(path)
+    return solution
@@ -0,0 +1,204 @@
+"""
+Closed-loop simulation on top of ode_solver, for the feedback control videos.
+
+A plant is plant(state, u, t) -> derivatives with u the control vector. A controller is
+called at its own sample rate and its output is held constant between the samples
+(zero-order hold), like the digital controller of a real system; the plant is integrated
+with any ode_solver integrator in between.
+
+LQR gains are computed from a linearization of the plant and cached, and many gain sets
+of a controller can be evaluated in parallel to tune it before rendering:
+    costs = evaluate_gains(plant, make_controller, gain_sets, initial_state, times, QuadraticCost(Q, R))
+"""
+import hashlib
+import logging
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from typing import Callable, Optional, Sequence
+
+import numpy as np
+from scipy.linalg import solve_continuous_are
+from lagrangian_mechanics.solver.ode_solver import integrate_rk4, _jacobian
+
+Plant = Callable[[np.ndarray, np.ndarray, float], np.ndarray]
+
+
+class Controller:
+    """
+    Computes the control vector from the sampled state, may keep its own state between the samples
+    """
+
+    def reset(self) -> None:
+        pass
+
+    def __call__(self, t: float, state: np.ndarray) -> np.ndarray:
+        raise NotImplementedError
+
+
+class LinearFeedback(Controller):
+    def __init__(self, K: np.ndarray, setpoint: Optional[np.ndarray] = None, u_max: Optional[float] = None,
+                 angles: Sequence[int] = ()):
+        """
+        u = -K (state - setpoint)
+        :param K: (m, n) gain matrix
+        :param u_max: saturation of the actuator
+        :param angles: indices of angular state components, their error is wrapped to [-pi, pi)
+        """
+        self.K = np.atleast_2d(np.asarray(K, dtype=float))
+        self.setpoint = np.zeros(self.K.shape[1]) if setpoint is None else np.asarray(setpoint, dtype=float)
+        self.u_max = u_max
+        self.angles = list(angles)
+
+    def __call__(self, t: float, state: np.ndarray) -> np.ndarray:
+        error = np.asarray(state, dtype=float) - self.setpoint
+        error[self.angles] = wrap_angle(error[self.angles])
+        u = -self.K @ error
+        return u if self.u_max is None else np.clip(u, -self.u_max, self.u_max)
+
+
+class SwitchingController(Controller):
+    """
+    Runs `swing_up` until `is_captured(state)` becomes true, then `hold`,
+    e.g. energy-based swing-up and LQR stabilization near the upright position
+    """
+
+    def __init__(self, swing_up: Controller, hold: Controller, is_captured: Callable[[np.ndarray], bool]):
+        self.swing_up = swing_up
+        self.hold = hold
+        self.is_captured = is_captured
+        self.captured_at = None
+
+    def reset(self) -> None:
+        self.swing_up.reset()
+        self.hold.reset()
+        self.captured_at = None
+
+    def __call__(self, t: float, state: np.ndarray) -> np.ndarray:
+        if self.captured_at is None and self.is_captured(state):
+            self.captured_at = t
+        return (self.swing_up if self.captured_at is None else self.hold)(t, state)
+
+
+def wrap_angle(angle):
+    return (angle + np.pi) % (2 * np.pi) - np.pi
+
+
+def simulate(plant: Plant, controller: Controller, initial_state, times, sample_time: Optional[float] = None,
+             integrate_func=integrate_rk4) -> (np.ndarray, np.ndarray):
+    """
+    Solves the closed-loop system, same time grid semantics as ode_solver.solve
+    :param plant: plant(state, u, t) -> derivatives
+    :param controller: sampled every `sample_time` seconds, every integration step if None
+    :param sample_time: rounded to a multiple of the integration step
+    :return: states (len(times) + 1, n) and controls (len(times), m), controls[i] is applied
+             on the step from states[i] to states[i + 1]
+    """
+    dt = times[1] - times[0]
+    hold_steps = 1
+    if sample_time is not None:
+        hold_steps = max(1, int(round(sample_time / dt)))
+        if not np.isclose(hold_steps * dt, sample_time):
+            logging.warning(f"Sample time {sample_time} is rounded to {hold_steps * dt}")
+
+    u = None
+
+    def derivatives(state, step, t, dt):
+        return plant(state, u, t)
+
+    controller.reset()
+    states = [np.asarray(initial_state, dtype=float)]
+    controls = []
+    for step, t in enumerate(times):
+        if step % hold_steps == 0:
+            u = np.atleast_1d(np.asarray(controller(t, states[-1]), dtype=float))
+        controls.append(u)
+        states.append(np.asarray(integrate_func(states[-1], step, t, dt, derivatives), dtype=float))
+    return np.array(states), np.array(controls)
+
+
+def linearize(plant: Plant, state, u, t: float = 0) -> (np.ndarray, np.ndarray):
+    """
+    :return: A = df/dx, B = df/du at the operating point, by finite differences
+    """
+    state = np.asarray(state, dtype=float)
+    u = np.atleast_1d(np.asarray(u, dtype=float))
+    A = _jacobian(lambda x: np.asarray(plant(x, u, t), dtype=float), state,
+                  np.asarray(plant(state, u, t), dtype=float))
+    B = _jacobian(lambda v: np.asarray(plant(state, v, t), dtype=float), u,
+                  np.asarray(plant(state, u, t), dtype=float))
+    return A, B
+
+
+_LQR_GAINS = {}
+
+
+def lqr(A: np.ndarray, B: np.ndarray, Q: np.ndarray, R: np.ndarray) -> np.ndarray:
+    """
+    Continuous-time LQR gain K = R^-1 B^T P, P solves the algebraic Riccati equation.
+    Gains are cached by the matrices, so they are computed once per setup.
+    """
+    A, B, Q, R = [np.atleast_2d(np.asarray(m, dtype=float)) for m in (A, B, Q, R)]
+    hasher = hashlib.sha256()
+    for m in (A, B, Q, R):
+        hasher.update(repr(m.shape).encode())
+        hasher.update(np.ascontiguousarray(m).tobytes())
+    key = hasher.hexdigest()
+
+    if key not in _LQR_GAINS:
+        P = solve_continuous_are(A, B, Q, R)
+        _LQR_GAINS[key] = np.linalg.solve(R, B.T @ P)
+    return _LQR_GAINS[key]
+
+
+class QuadraticCost:
+    """
+    Integral of x^T Q x + u^T R u over the trajectory, angles are wrapped before weighting
+    """
+
+    def __init__(self, Q: np.ndarray, R: np.ndarray, setpoint: Optional[np.ndarray] = None, angles: Sequence[int] = ()):
+        self.Q = np.atleast_2d(np.asarray(Q, dtype=float))
+        self.R = np.atleast_2d(np.asarray(R, dtype=float))
+        self.setpoint = setpoint
+        self.angles = list(angles)
+
+    def __call__(self, states: np.ndarray, controls: np.ndarray, times: np.ndarray) -> float:
+        dt = times[1] - times[0]
+        error = states[:-1] - (0 if self.setpoint is None else self.setpoint)
+        error[:, self.angles] = wrap_angle(error[:, self.angles])
+        x_cost = np.einsum("ij,jk,ik->i", error, self.Q, error)
+        u_cost = np.einsum("ij,jk,ik->i", controls, self.R, controls)
+        return float((x_cost + u_cost).sum() * dt)
+
+
+def _evaluate(plant, controller_factory, initial_state, times, cost, sample_time, integrate_func, gains) -> float:
+    states, controls = simulate(plant, controller_factory(gains), initial_state, times, sample_time, integrate_func)
+    value = cost(states, controls, times)
+    return value if np.isfinite(value) else np.inf
+
+
+def evaluate_gains(plant: Plant,
+                   controller_factory: Callable[[Sequence[float]], Controller],
+                   gain_sets: Sequence[Sequence[float]],
+                   initial_state,
+                   times,
+                   cost: Callable[[np.ndarray, np.ndarray, np.ndarray], float],
+                   sample_time: Optional[float] = None,
+                   integrate_func=integrate_rk4,
+                   processes: Optional[int] = None) -> np.ndarray:
+    """
+    Simulates the closed loop for every gain set in a process pool.
+    The plant, the factory and the cost must be picklable (module level functions or classes).
+    :param controller_factory: builds a controller from a gain set
+    :param cost: cost(states, controls, times), e.g. QuadraticCost
+    :return: cost of every gain set, inf for diverged simulations
+    """
+    with ProcessPoolExecutor(processes) as pool:
+        costs = list(pool.map(
+            _evaluate, repeat(plant), repeat(controller_factory), repeat(initial_state), repeat(times),
+            repeat(cost), repeat(sample_time), repeat(integrate_func), gain_sets))
+    return np.array(costs)
+
+
+def best_gains(gain_sets: Sequence[Sequence[float]], costs: np.ndarray) -> (Sequence[float], float):
+    i = int(np.argmin(costs))
+    return gain_sets[i], float(costs[i])
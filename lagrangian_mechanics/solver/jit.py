@@ -0,0 +1,112 @@
+"""
+Optional native fast path for small systems, where the cost of solve() is Python dispatch per step.
+
+Derivative functions in the restricted style are plain NumPy code which Numba can compile:
+    @jit
+    def derivatives(state, t, params):
+        out = np.empty(2)
+        out[0] = state[1]
+        out[1] = -params[0] * sin(state[0])
+        return out
+i.e. a module level function of a float array state, the time and a float array of parameters,
+using only arithmetic, math functions and arrays. solve_rk4 runs the whole RK4 loop in native code
+with Numba installed, and falls back to solve() with integrate_rk4 otherwise, with the same results;
+solve_rk4_with_events does the same for solve_with_events().
+"""
+from functools import lru_cache
+
+import numpy as np
+from lagrangian_mechanics.solver.ode_solver import solve, solve_with_events, integrate_rk4, EventTracker
+
+try:
+    import numba
+except ImportError:
+    numba = None
+
+JIT_AVAILABLE = numba is not None
+
+# number of steps solved natively between the checks of the events
+EVENTS_CHUNK_STEPS = 1024
+
+
+def jit(func):
+    """
+    Compiles a function in the restricted style with Numba, leaves it as is without Numba
+    """
+    if not JIT_AVAILABLE:
+        return func
+    return numba.njit(cache=True)(func)
+
+
+@lru_cache(maxsize=None)
+def _compile_rk4(derivatives):
+    f = derivatives if isinstance(derivatives, numba.core.dispatcher.Dispatcher) else numba.njit(derivatives)
+
+    @numba.njit
+    def solve_steps(out, t0, dt, first_step, params):
+        # out[0] is the initial state, the same time of all stages as in integrate_rk4
+        for i in range(len(out) - 1):
+            y = out[i]
+            t = t0 + (first_step + i) * dt
+            k1 = f(y, t, params)
+            k2 = f(y + k1 * (dt / 2), t, params)
+            k3 = f(y + k2 * (dt / 2), t, params)
+            k4 = f(y + k3 * dt, t, params)
+            out[i + 1] = y + (k1 + 2 * k2 + 2 * k3 + k4) * (dt / 6)
+
+    return solve_steps
+
+
+class Derivatives:
+    """
+    Adapts derivatives in the restricted style to derivative_func(state, step, t, dt) of solve(), picklable
+    """
+
+    def __init__(self, derivatives, params=()):
+        self.derivatives = derivatives
+        self.params = np.asarray(params, dtype=float)
+
+    def __call__(self, state, step, t, dt):
+        return self.derivatives(np.asarray(state, dtype=float), t, self.params)
+
+
+def solve_rk4(initial_state, times, derivatives, params=()):
+    """
+    Same as solve(initial_state, times, integrate_rk4, ...) for derivatives in the restricted style
+    :param derivatives: derivatives(state, t, params) -> array
+    :param params: float parameters passed to the derivatives
+    :return: states
+    """
+    params = np.asarray(params, dtype=float)
+    if not JIT_AVAILABLE:
+        return solve(initial_state, times, integrate_rk4, Derivatives(derivatives, params))
+
+    out = np.empty((len(times) + 1, len(initial_state)))
+    out[0] = initial_state
+    _compile_rk4(derivatives)(out, times[0], times[1] - times[0], 0, params)
+    return out
+
+
+def solve_rk4_with_events(initial_state, times, derivatives, params, events):
+    """
+    Same as solve_with_events(initial_state, times, integrate_rk4, ...) for derivatives in the restricted style,
+    the events are checked in Python between chunks of natively solved steps
+    :return: (states, occurrences)
+    """
+    params = np.asarray(params, dtype=float)
+    derivative_func = Derivatives(derivatives, params)
+    if not JIT_AVAILABLE:
+        return solve_with_events(initial_state, times, integrate_rk4, derivative_func, events)
+
+    solve_steps = _compile_rk4(derivatives)
+    t0, dt = times[0], times[1] - times[0]
+    out = np.empty((len(times) + 1, len(initial_state)))
+    out[0] = initial_state
+    tracker = EventTracker(events, t0, out[0])
+    for start in range(0, len(times), EVENTS_CHUNK_STEPS):
+        end = min(start + EVENTS_CHUNK_STEPS, len(times))
+        solve_steps(out[start:end + 1], t0, dt, start, params)
+        for step in range(start, end):
+            if tracker.check(step, t0 + step * dt, dt, out[step], out[step + 1], integrate_rk4, derivative_func):
+                return out[:step + 2].copy(), tracker.occurrences
+    return out, tracker.occurrences
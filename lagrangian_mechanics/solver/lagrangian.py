@@ -0,0 +1,149 @@
+"""
+Derives equations of motion from a symbolic Lagrangian and compiles them into NumPy derivative functions.
+
+The Euler-Lagrange equations with the Rayleigh dissipation function D
+    d/dt(dL/d(dq)) - dL/dq + dD/d(dq) = Q,  L = T - V
+are solved for the generalized accelerations. Parameters are substituted before code generation,
+so constant subexpressions are folded and the common ones are hoisted into local variables.
+Generated sources are cached on disk by a hash of the system and its parameters.
+
+Example, the unbalanced wheel:
+    th, w, r, R, m, b, g = sympy.symbols("theta omega r R m b g")
+    system = LagrangianSystem(
+        q=[th], dq=[w],
+        T=m * w ** 2 * (r ** 2 + R ** 2 + 2 * r * R * sympy.sin(th)) / 2,
+        V=m * g * (R + r * sympy.cos(th)),
+        D=b * w ** 2 / 2)
+    derivatives = system.compile({r: 1, R: 2, m: 1, b: 0.8, g: 9.81})
+    solution = solve(np.array([3 * PI / 5, 0]), times, integrate_rk4, derivatives)
+"""
+import hashlib
+import logging
+import os
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+import sympy as sp
+from sympy.printing.numpy import NumPyPrinter
+
+CACHE_DIR = Path(os.environ.get(
+    "INNER_NERD_LAGRANGIAN_CACHE", Path.home() / ".cache" / "inner-nerd" / "lagrangian"))
+
+TIME = sp.Symbol("t")
+
+_CODEGEN_VERSION = 2
+
+
+class LagrangianSystem:
+    def __init__(self,
+                 q: List[sp.Symbol],
+                 dq: List[sp.Symbol],
+                 T: sp.Expr,
+                 V: sp.Expr,
+                 D: sp.Expr = sp.S.Zero,
+                 forces: Optional[List[sp.Expr]] = None):
+        """
+        :param q: generalized coordinates
+        :param dq: generalized velocities, in the same order
+        :param T: kinetic energy
+        :param V: potential energy
+        :param D: Rayleigh dissipation function
+        :param forces: generalized external forces, may depend on time symbol TIME
+        """
+        if len(q) != len(dq):
+            raise ValueError("Number of coordinates and velocities should match")
+        self.q = list(q)
+        self.dq = list(dq)
+        self.T = sp.sympify(T)
+        self.V = sp.sympify(V)
+        self.D = sp.sympify(D)
+        self.forces = [sp.sympify(f) for f in forces] if forces else [sp.S.Zero] * len(q)
+        self._accelerations = None
+
+    def accelerations(self) -> List[sp.Expr]:
+        """
+        :return: generalized accelerations solved from the Euler-Lagrange equations
+        """
+        if self._accelerations is None:
+            L = self.T - self.V
+            p = [sp.diff(L, dq_i) for dq_i in self.dq]
+            mass = sp.Matrix([[sp.diff(p_i, dq_j) for dq_j in self.dq] for p_i in p])
+            rhs = sp.Matrix([
+                sp.diff(L, q_i)
+                - sum(sp.diff(p_i, q_j) * dq_j for q_j, dq_j in zip(self.q, self.dq))
+                - sp.diff(p_i, TIME)
+                - sp.diff(self.D, dq_i)
+                + f_i
+                for q_i, dq_i, p_i, f_i in zip(self.q, self.dq, p, self.forces)
+            ])
+            self._accelerations = list(mass.LUsolve(rhs))
+        return self._accelerations
+
+    def energy(self) -> sp.Expr:
+        return self.T + self.V
+
+    def compile(self, params: Optional[Dict[sp.Symbol, float]] = None) -> Callable:
+        """
+        :param params: numeric values of the parameters
+        :return: derivatives(state, step, t, dt) for ode_solver.solve, state = [q..., dq...];
+                 a (2n, m) array of states is evaluated at once
+        """
+        key = self._get_key("derivatives", params)
+        return _load_or_generate(key, "derivatives", lambda: list(self.dq) + self.accelerations(), self, params)
+
+    def compile_energy(self, params: Optional[Dict[sp.Symbol, float]] = None) -> Callable:
+        """
+        :return: energy(state) = T + V, vectorized the same way as the derivatives
+        """
+        key = self._get_key("energy", params)
+        return _load_or_generate(key, "energy", lambda: self.energy(), self, params)
+
+    def _get_key(self, kind: str, params: Optional[Dict[sp.Symbol, float]]) -> str:
+        values = sorted((str(k), float(v)) for k, v in (params or {}).items())
+        id_str = repr((_CODEGEN_VERSION, kind, sp.srepr(self.q), sp.srepr(self.dq), sp.srepr(self.T),
+                       sp.srepr(self.V), sp.srepr(self.D), sp.srepr(self.forces), values))
+        return hashlib.sha256(id_str.encode()).hexdigest()[:16]
+
+
+def _generate_source(name: str, exprs, system: LagrangianSystem, params) -> str:
+    n = len(system.q)
+    names = {s: sp.Symbol(f"q{i}") for i, s in enumerate(system.q)}
+    names.update({s: sp.Symbol(f"dq{i}") for i, s in enumerate(system.dq)})
+
+    scalar = not isinstance(exprs, list)
+    exprs = [sp.sympify(e).subs(params or {}).xreplace(names) for e in (exprs if not scalar else [exprs])]
+    free = set().union(*[e.free_symbols for e in exprs]) - set(names.values()) - {TIME}
+    if len(free) > 0:
+        raise ValueError(f"Parameters without values: {free}")
+
+    replacements, reduced = sp.cse(exprs, symbols=sp.numbered_symbols("x"))
+    printer = NumPyPrinter()
+    state = ", ".join([f"q{i}" for i in range(n)] + [f"dq{i}" for i in range(n)])
+    lines = [
+        f"def {name}(state, step=0, t=0, dt=0):",
+        f"    {state}, = state",
+        *[f"    {s} = {printer.doprint(e)}" for s, e in replacements],
+    ]
+    # terms without the state are broadcast to its shape, so a (2n, m) array of states gives (2n, m) or (m,)
+    results = [printer.doprint(e) for e in reduced]
+    lines.append(f"    return numpy.array(numpy.broadcast_arrays({', '.join(results)}, q0)[:-1])"
+                 + ("[0]" if scalar else ""))
+    return "\n".join(lines) + "\n"
+
+
+def _load_or_generate(key: str, name: str, get_exprs: Callable, system: LagrangianSystem, params) -> Callable:
+    path = CACHE_DIR / f"{key}.py"
+    if path.exists():
+        source = path.read_text()
+    else:
+        logging.info(f"Deriving {name} of the Lagrangian system...")
+        source = _generate_source(name, get_exprs(), system, params)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(f".{os.getpid()}.tmp")
+        tmp.write_text(source)
+        tmp.replace(path)
+
+    namespace = {"numpy": np}
+    exec(compile(source, str(path), "exec"), namespace)
+    return namespace[name]
@@ -1,3 +1,6 @@
+from dataclasses import dataclass
+from itertools import chain
+
 import numpy as np
 
 
@@ -49,11 +52,295 @@ def integrate_rk4(state, step, t, dt, dydx_func):
     return [v + (k1_ + 2 * k2_ + 2 * k3_ + k4_) * dt / 6 for v, k1_, k2_, k3_, k4_ in zip(state, k1, k2, k3, k4)]
 
 
+def _split(state):
+    state = np.asarray(state, dtype=float)
+    n = len(state) // 2
+    return state[:n], state[n:]
+
+
+def integrate_semi_implicit_euler(state, step, t, dt, dydx_func):
+    """
+    First-order symplectic Euler method.
+    The state is expected to be [positions..., velocities...] and the derivatives [velocities..., accelerations...]
+    Source: https://en.wikipedia.org/wiki/Semi-implicit_Euler_method
+    :param state:
+    :param step: index of the integration step
+    :param t:
+    :param dt:
+    :param dydx_func:
+    :return:
+    """
+    q, v = _split(state)
+    a = np.asarray(dydx_func(state, step, t, dt), dtype=float)[len(q):]
+    v1 = v + a * dt
+    return np.concatenate((q + v1 * dt, v1))
+
+
+def integrate_velocity_verlet(state, step, t, dt, dydx_func):
+    """
+    Second-order symplectic velocity Verlet method, for conservative systems.
+    The state is expected to be [positions..., velocities...] and the derivatives [velocities..., accelerations...],
+    velocity dependent forces are evaluated at the Euler-predicted velocity.
+    Source: https://en.wikipedia.org/wiki/Verlet_integration#Velocity_Verlet
+    :param state:
+    :param step: index of the integration step
+    :param t:
+    :param dt:
+    :param dydx_func:
+    :return:
+    """
+    q, v = _split(state)
+    n = len(q)
+    a = np.asarray(dydx_func(state, step, t, dt), dtype=float)[n:]
+    q1 = q + v * dt + a * (dt ** 2 / 2)
+    a1 = np.asarray(dydx_func(np.concatenate((q1, v + a * dt)), step, t + dt, dt), dtype=float)[n:]
+    return np.concatenate((q1, v + (a + a1) * (dt / 2)))
+
+
+def integrate_leapfrog(state, step, t, dt, dydx_func):
+    """
+    Second-order symplectic leapfrog method in the kick-drift-kick form.
+    The state is expected to be [positions..., velocities...] and the derivatives [velocities..., accelerations...],
+    velocity dependent forces are evaluated at the half-step velocity.
+    Source: https://en.wikipedia.org/wiki/Leapfrog_integration
+    :param state:
+    :param step: index of the integration step
+    :param t:
+    :param dt:
+    :param dydx_func:
+    :return:
+    """
+    q, v = _split(state)
+    n = len(q)
+    a = np.asarray(dydx_func(state, step, t, dt), dtype=float)[n:]
+    v_half = v + a * (dt / 2)
+    q1 = q + v_half * dt
+    a1 = np.asarray(dydx_func(np.concatenate((q1, v_half)), step, t + dt, dt), dtype=float)[n:]
+    return np.concatenate((q1, v_half + a1 * (dt / 2)))
+
+
+def _jacobian(func, x, fx, eps=1e-8):
+    jacobian = np.empty((len(fx), len(x)))
+    for i in range(len(x)):
+        h = eps * max(1.0, abs(x[i]))
+        x_h = x.copy()
+        x_h[i] += h
+        jacobian[:, i] = (func(x_h) - fx) / h
+    return jacobian
+
+
+class ConvergenceError(ArithmeticError):
+    """
+    Newton iterations of an implicit integrator did not converge, a smaller time step usually helps
+    """
+
+
+def _solve_newton(residual, guess, tol=1e-10, max_iterations=20):
+    """
+    Solves residual(x) = 0 with Newton's method and a finite-difference Jacobian
+    :raises ConvergenceError: if the iterations don't converge
+    """
+    x = guess
+    for _ in range(max_iterations):
+        r = residual(x)
+        try:
+            dx = np.linalg.solve(_jacobian(residual, x, r), -r)
+        except np.linalg.LinAlgError as e:
+            raise ConvergenceError(f"Newton's method failed: {e}") from e
+        x = x + dx
+        if not np.all(np.isfinite(x)):
+            break
+        if np.max(np.abs(dx)) <= tol * (1 + np.max(np.abs(x))):
+            return x
+    raise ConvergenceError(f"Newton's method did not converge in {max_iterations} iterations, "
+                           f"the last correction is {np.max(np.abs(dx))}")
+
+
+def integrate_backward_euler(state, step, t, dt, dydx_func):
+    """
+    First-order implicit (backward) Euler method, for stiff systems.
+    Raises ConvergenceError if the step is too large for Newton's method.
+    Source: https://en.wikipedia.org/wiki/Backward_Euler_method
+    :param state:
+    :param step: index of the integration step
+    :param t:
+    :param dt:
+    :param dydx_func:
+    :return:
+    """
+    y0 = np.asarray(state, dtype=float)
+
+    def residual(y):
+        return y - y0 - dt * np.asarray(dydx_func(y, step, t + dt, dt), dtype=float)
+
+    guess = y0 + dt * np.asarray(dydx_func(y0, step, t, dt), dtype=float)
+    return _solve_newton(residual, guess)
+
+
+RADAU_A = np.array([[5 / 12, -1 / 12], [3 / 4, 1 / 4]])
+RADAU_C = np.array([1 / 3, 1])
+
+
+def integrate_radau(state, step, t, dt, dydx_func):
+    """
+    Third-order implicit two-stage Radau IIA method, for stiff systems.
+    The method is stiffly accurate: the next state is the last stage.
+    Raises ConvergenceError if the step is too large for Newton's method.
+    Source: https://en.wikipedia.org/wiki/List_of_Runge%E2%80%93Kutta_methods#Radau_IIA_methods
+    :param state:
+    :param step: index of the integration step
+    :param t:
+    :param dt:
+    :param dydx_func:
+    :return:
+    """
+    y0 = np.asarray(state, dtype=float)
+    n = len(y0)
+
+    def residual(k):
+        k1, k2 = k[:n], k[n:]
+        return np.concatenate([
+            k_i - np.asarray(dydx_func(y0 + dt * (a[0] * k1 + a[1] * k2), step, t + c * dt, dt), dtype=float)
+            for k_i, a, c in zip((k1, k2), RADAU_A, RADAU_C)
+        ])
+
+    k0 = np.asarray(dydx_func(y0, step, t, dt), dtype=float)
+    k = _solve_newton(residual, np.concatenate((k0, k0)))
+    return y0 + dt * (RADAU_A[1, 0] * k[:n] + RADAU_A[1, 1] * k[n:])
+
+
 def derivatives_circle(state, step, t, dt):
     x, v = state
     return [v, -x]
 
 
+class Event:
+    """
+    Zero crossing of a function of the state, detected by solve_with_events().
+    Subclasses implement __call__(t, state) and may define:
+      - terminal: integration stops at the first occurrence
+      - direction: 1 for crossings from negative to positive values, -1 for the opposite, 0 for both
+      - update(t, state): called with every accepted step, for events which depend on the history
+      - reset(): called before the integration starts
+    Plain functions f(t, state) are accepted as non-terminal events as well.
+    """
+    terminal = False
+    direction = 0
+
+    def __call__(self, t, state):
+        raise NotImplementedError
+
+
+class _Crossing(Event):
+    def __init__(self, index, value, direction, terminal):
+        self.index = index
+        self.value = value
+        self.direction = direction
+        self.terminal = terminal
+
+    def __call__(self, t, state):
+        return state[self.index] - self.value
+
+
+class _BelowFor(Event):
+    def __init__(self, index, eps, duration, terminal):
+        self.index = index
+        self.eps = eps
+        self.duration = duration
+        self.terminal = terminal
+        self.direction = 1
+        self.since = None
+
+    def reset(self):
+        self.since = None
+
+    def update(self, t, state):
+        if abs(state[self.index]) >= self.eps:
+            self.since = None
+        elif self.since is None:
+            self.since = t
+
+    def __call__(self, t, state):
+        if self.since is None or abs(state[self.index]) >= self.eps:
+            return -self.duration
+        return t - self.since - self.duration
+
+
+def crossing(index, value, direction=0, terminal=False):
+    """
+    Event of the state component `index` crossing `value`, e.g. the angle crossing pi
+    """
+    return _Crossing(index, value, direction, terminal)
+
+
+def below_for(index, eps, duration, terminal=True):
+    """
+    Event of |state[index]| staying below eps for `duration` seconds, e.g. the system came to rest
+    """
+    return _BelowFor(index, eps, duration, terminal)
+
+
+@dataclass
+class EventOccurrence:
+    event: int  # index in the list of events
+    t: float
+    state: np.ndarray
+    step: int  # the event happened on the step from states[step] to states[step + 1]
+
+
+def _is_crossed(g0, g1, direction):
+    rising = g0 < 0 <= g1
+    falling = g0 > 0 >= g1
+    return (rising and direction >= 0) or (falling and direction <= 0)
+
+
+def _locate_event(event, g0, state, step, t, dt, integrate_func, derivative_func, tol=1e-10):
+    """
+    Finds the time of the event within the step by bisection over partial steps of the integrator
+    """
+    lo, hi = 0.0, dt
+    state_hi = integrate_func(state, step, t, dt, derivative_func)
+    while hi - lo > tol * dt:
+        mid = (lo + hi) / 2
+        state_mid = integrate_func(state, step, t, mid, derivative_func)
+        if _is_crossed(g0, event(t + mid, state_mid), 0):
+            hi, state_hi = mid, state_mid
+        else:
+            lo = mid
+    return t + hi, np.asarray(state_hi, dtype=float)
+
+
+class EventTracker:
+    """
+    Checks events on every accepted step, for solvers which produce the states step by step
+    """
+
+    def __init__(self, events, t0, initial_state):
+        self.events = events
+        for event in events:
+            if hasattr(event, "reset"):
+                event.reset()
+        self.values = [event(t0, initial_state) for event in events]
+        self.occurrences = []
+
+    def check(self, step, t, dt, state, next_state, integrate_func, derivative_func) -> bool:
+        """
+        :return: True if a terminal event occurred on the step from `state` to `next_state`
+        """
+        stop = False
+        for i, event in enumerate(self.events):
+            value = event(t + dt, next_state)
+            if _is_crossed(self.values[i], value, getattr(event, "direction", 0)):
+                t_event, event_state = _locate_event(
+                    event, self.values[i], state, step, t, dt, integrate_func, derivative_func)
+                self.occurrences.append(EventOccurrence(i, t_event, event_state, step))
+                stop = stop or getattr(event, "terminal", False)
+            self.values[i] = value
+            if hasattr(event, "update"):
+                event.update(t + dt, next_state)
+        return stop
+
+
 def solve(initial_state, times, integrate_func, derivative_func):
     """
     Solves the initial-value problem of the first order ODEs
@@ -61,10 +348,69 @@ def solve(initial_state, times, integrate_func, derivative_func):
     :param times: a sequence of time points for which to solve
     :param integrate_func: calculates the next state
     :param derivative_func: computes derivatives of each state component
-    :return:
+    :return: states
     """
     dt = times[1] - times[0]
     states = [initial_state]
     for step, t in enumerate(times):
         states.append(integrate_func(states[-1], step, t, dt, derivative_func))
     return np.array(states)
+
+
+def solve_with_events(initial_state, times, integrate_func, derivative_func, events):
+    """
+    Same as solve(), detects events on every step
+    :param events: list of events, see Event; the time of an occurrence is refined by bisection
+    :return: (states, occurrences), states end with the step of a terminal event
+    """
+    dt = times[1] - times[0]
+    states = [initial_state]
+    tracker = EventTracker(events, times[0], initial_state)
+    for step, t in enumerate(times):
+        states.append(integrate_func(states[-1], step, t, dt, derivative_func))
+        if tracker.check(step, t, dt, states[-2], states[-1], integrate_func, derivative_func):
+            break
+    return np.array(states), tracker.occurrences
+
+
+def sample(solution, times, t):
+    """
+    State at the time t, linearly interpolated between the integration steps
+    :param solution: result of solve(), solution[i] is the state at times[0] + i * dt
+    :param times: time points the solution was solved for
+    :param t:
+    :return:
+    """
+    dt = times[1] - times[0]
+    x = min(max((t - times[0]) / dt, 0), len(solution) - 1)
+    i = min(int(x), len(solution) - 2)
+    alpha = x - i
+    return solution[i] * (1 - alpha) + solution[i + 1] * alpha
+
+
+def solve_iter(initial_state, times, integrate_func, derivative_func, chunk_size=1024):
+    """
+    Same as solve(), but yields the states in chunks, so memory doesn't grow with the duration.
+    :param times: a sequence or an iterator of equally spaced time points, may be unbounded
+    :param chunk_size: number of states in a chunk
+    :return: generator of (k, n) arrays, k <= chunk_size; the first chunk starts with the initial state.
+             Chunks are views of one buffer, which is overwritten by the next chunk: copy to keep them
+    """
+    times = iter(times)
+    t0 = next(times)
+    t1 = next(times)
+    dt = t1 - t0
+
+    buffer = np.empty((chunk_size, len(initial_state)))
+    buffer[0] = initial_state
+    state = buffer[0]
+    k = 1
+    for step, t in enumerate(chain((t0, t1), times)):
+        if k == chunk_size:
+            yield buffer
+            k = 0
+        state = integrate_func(state, step, t, dt, derivative_func)
+        buffer[k] = state
+        state = buffer[k]
+        k += 1
+    yield buffer[:k]
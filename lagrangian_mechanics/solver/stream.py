@@ -0,0 +1,98 @@
+"""
+Streaming of long trajectories, memory stays flat regardless of the simulated duration.
+
+A trajectory is either written chunk by chunk into a memory-mapped trajectory file:
+    trajectory = solve_to_file("media/trajectories/loop.traj", initial_state, times, integrate_rk4, derivatives)
+or consumed directly by the frame producer while it is being solved:
+    stream = TrajectoryStream(solve_iter(initial_state, times, integrate_rk4, derivatives), times[0], dt)
+    mob.add_updater(lambda m: m.move_to(to_point(stream.at(time.get_value()))))
+"""
+import os
+from pathlib import Path
+from typing import Iterator, Optional
+
+import numpy as np
+from lagrangian_mechanics.solver.ode_solver import solve_iter
+from lagrangian_mechanics.solver.trajectory import TrajectoryFile
+
+
+def solve_to_file(path, initial_state, times, integrate_func, derivative_func, chunk_size=1024,
+                  dtype=np.float64, metadata: Optional[dict] = None) -> TrajectoryFile:
+    """
+    Solves into a memory-mapped trajectory file, see solve_iter and TrajectoryFile
+    :param chunk_size: number of states in a chunk, also the chunk size of the file
+    :param dtype: float32 halves the size of the file for rendering-only trajectories
+    :param metadata: JSON-serializable description of the system stored in the header
+    :return: the trajectory file opened for reading
+    """
+    path = Path(path)
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+
+    dt = times[1] - times[0]
+    trajectory = TrajectoryFile.create(tmp, len(times) + 1, len(initial_state), times[0], dt,
+                                       dtype, chunk_size, metadata)
+    start = 0
+    for chunk in solve_iter(initial_state, times, integrate_func, derivative_func, chunk_size):
+        trajectory.write(start, chunk)
+        start += len(chunk)
+    trajectory.close()
+
+    tmp.replace(path)
+    return TrajectoryFile.open(path)
+
+
+class TrajectoryStream:
+    """
+    Forward-only sampler over chunks of states, for updaters which read the trajectory
+    at non-decreasing times. Only the current chunk and the last state before it are kept.
+    """
+
+    def __init__(self, chunks: Iterator[np.ndarray], t0: float, dt: float):
+        """
+        :param chunks: e.g. solve_iter(...), chunk buffers may be reused by the producer
+        :param t0: time of the first state
+        :param dt: time step between the states
+        """
+        self.chunks = chunks
+        self.t0 = t0
+        self.dt = dt
+        self.chunk = next(chunks)
+        self.start = 0  # step index of chunk[0]
+        self.previous = None  # the state before chunk[0]
+        self.finished = False
+
+    def _advance(self) -> bool:
+        # the producer may overwrite the current chunk while making the next one
+        last = self.chunk[-1].copy()
+        chunk = next(self.chunks, None)
+        if chunk is None or len(chunk) == 0:
+            self.finished = True
+            return False
+        self.previous = last
+        self.start += len(self.chunk)
+        self.chunk = chunk
+        return True
+
+    def _get_state(self, i: int) -> np.ndarray:
+        if i == self.start - 1:
+            return self.previous
+        return self.chunk[i - self.start]
+
+    def at(self, t: float) -> np.ndarray:
+        """
+        State at the time t, linearly interpolated between the integration steps;
+        the last state once the trajectory is over
+        """
+        x = max((t - self.t0) / self.dt, 0)
+        i = int(x)
+        if i < self.start - 1:
+            raise ValueError(f"Time {t} is behind the stream, it can only go forward")
+
+        while i + 1 >= self.start + len(self.chunk) and not self.finished:
+            self._advance()
+
+        end = self.start + len(self.chunk) - 1
+        if i >= end:
+            return self.chunk[-1].copy()
+        alpha = x - i
+        return self._get_state(i) * (1 - alpha) + self._get_state(i + 1) * alpha
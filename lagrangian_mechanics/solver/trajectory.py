@@ -0,0 +1,142 @@
+"""
+Memory-mapped trajectory file for outputs which don't fit comfortably in RAM (ensembles, N-body).
+
+Layout:
+    magic     8 bytes  b"INNRTRJ\\0"
+    length    4 bytes  little-endian uint32, length of the header
+    header    JSON: version, dtype, n_states, state_size, t0, dt, chunk_steps, metadata;
+              padded with spaces, so the body starts at a multiple of ALIGNMENT
+    body      n_states x state_size contiguous float32/float64 values, C order
+
+The body is mapped into memory, so a frame or a chunk of frames is read with zero copies
+and only the pages which are touched are loaded: scrubbing to a time range or rendering
+in several processes reads just the frames it needs. Chunks of chunk_steps states are
+the unit of writing and of sequential reading.
+"""
+import json
+import struct
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+
+MAGIC = b"INNRTRJ\0"
+VERSION = 1
+ALIGNMENT = 4096
+
+_PREFIX = struct.Struct("<8sI")
+
+
+class TrajectoryFile:
+    def __init__(self, path: Path, header: dict, offset: int, mode: str):
+        self.path = Path(path)
+        self.header = header
+        self.metadata = header.get("metadata", {})
+        self.n_states = header["n_states"]
+        self.state_size = header["state_size"]
+        self.t0 = header["t0"]
+        self.dt = header["dt"]
+        self.chunk_steps = header["chunk_steps"]
+        self.states = np.memmap(self.path, dtype=np.dtype(header["dtype"]), mode=mode, offset=offset,
+                                shape=(self.n_states, self.state_size))
+
+    @classmethod
+    def create(cls, path, n_states: int, state_size: int, t0: float, dt: float,
+               dtype=np.float64, chunk_steps: int = 1024, metadata: Optional[dict] = None) -> "TrajectoryFile":
+        """
+        Creates a file of the given size for writing
+        :param metadata: JSON-serializable description of the system, e.g. parameters of the model
+        """
+        dtype = np.dtype(dtype)
+        if dtype not in (np.float32, np.float64):
+            raise ValueError(f"Unsupported dtype: {dtype}")
+        header = {
+            "version": VERSION,
+            "dtype": dtype.name,
+            "n_states": int(n_states),
+            "state_size": int(state_size),
+            "t0": float(t0),
+            "dt": float(dt),
+            "chunk_steps": int(chunk_steps),
+            "metadata": metadata or {},
+        }
+        encoded = json.dumps(header).encode()
+        offset = -(-(_PREFIX.size + len(encoded)) // ALIGNMENT) * ALIGNMENT
+        encoded = encoded.ljust(offset - _PREFIX.size)
+
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with path.open("wb") as fp:
+            fp.write(_PREFIX.pack(MAGIC, len(encoded)))
+            fp.write(encoded)
+            fp.truncate(offset + n_states * state_size * dtype.itemsize)
+        return cls(path, header, offset, "r+")
+
+    @classmethod
+    def open(cls, path, mode: str = "r") -> "TrajectoryFile":
+        """
+        :param mode: "r" for reading, "r+" for updating
+        """
+        with Path(path).open("rb") as fp:
+            magic, length = _PREFIX.unpack(fp.read(_PREFIX.size))
+            if magic != MAGIC:
+                raise ValueError(f"{path} is not a trajectory file")
+            header = json.loads(fp.read(length))
+        if header["version"] != VERSION:
+            raise ValueError(f"Unsupported trajectory file version: {header['version']}")
+        return cls(path, header, _PREFIX.size + length, mode)
+
+    @property
+    def n_chunks(self) -> int:
+        return -(-self.n_states // self.chunk_steps)
+
+    @property
+    def duration(self) -> float:
+        return (self.n_states - 1) * self.dt
+
+    def get_step(self, t: float) -> int:
+        return min(max(int((t - self.t0) / self.dt), 0), self.n_states - 1)
+
+    def frame(self, step: int) -> np.ndarray:
+        """
+        :return: the state of the step, a view of the file
+        """
+        return self.states[step]
+
+    def at(self, t: float) -> np.ndarray:
+        """
+        State at the time t, linearly interpolated between the steps
+        """
+        x = min(max((t - self.t0) / self.dt, 0), self.n_states - 1)
+        i = min(int(x), self.n_states - 2)
+        alpha = x - i
+        return self.states[i] * (1 - alpha) + self.states[i + 1] * alpha
+
+    def chunk(self, index: int) -> np.ndarray:
+        """
+        :return: states of the chunk, a view of the file
+        """
+        return self.states[index * self.chunk_steps:(index + 1) * self.chunk_steps]
+
+    def times(self) -> np.ndarray:
+        return self.t0 + np.arange(self.n_states) * self.dt
+
+    def write(self, start: int, states: np.ndarray) -> None:
+        self.states[start:start + len(states)] = states
+
+    def flush(self) -> None:
+        self.states.flush()
+
+    def close(self) -> None:
+        """
+        Flushes the changes, the mapping is released when no views of the states are left
+        """
+        if self.states is not None and self.states.mode != "r":
+            self.states.flush()
+        self.states = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
@@ -0,0 +1,184 @@
+"""
+Choice of the integrator and the number of steps by a convergence study.
+
+Every integrator is solved with increasing step counts in a process pool and compared with
+a high-accuracy reference at the frame times of the video. Frames interpolate the states between
+the steps, as the simulations draw them with ode_solver.sample, and the error is measured in scene
+units (e.g. the displacement of a mass on the screen), so the tolerance is a visual one. RK4 of
+derivatives in the restricted style (jit.Derivatives) is solved and timed natively when Numba
+is available, as the simulations solve it.
+The cheapest configuration within the tolerance is recommended; recommendations are cached
+on disk by the description of the system, and their key is meant to be a part of
+trajectory cache keys and render signatures, so a different choice never reuses old results.
+
+    recommendation = recommend(initial_state, t_end, derivatives, to_scene, system_key, tolerance=0.01)
+    times = np.linspace(0, t_end, recommendation.n_steps)
+    solution = cached_solve(initial_state, times, recommendation.get_integrator(), derivatives,
+                            f"{system_key}|{recommendation.key}")
+"""
+import hashlib
+import json
+import logging
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, asdict
+from pathlib import Path
+from typing import Callable, List, Optional, Sequence
+
+import numpy as np
+from lagrangian_mechanics.solver import ode_solver
+from lagrangian_mechanics.solver.ode_solver import solve
+from lagrangian_mechanics.solver.jit import JIT_AVAILABLE, Derivatives, solve_rk4
+
+CACHE_DIR = Path(os.environ.get(
+    "INNER_NERD_TUNING_CACHE", Path.home() / ".cache" / "inner-nerd" / "tuning"))
+
+DEFAULT_INTEGRATORS = ["euler", "heuns", "rk4", "semi_implicit_euler", "velocity_verlet", "leapfrog"]
+DEFAULT_STEP_COUNTS = [250, 500, 1000, 2000, 4000, 8000, 16000, 32000]
+FRAME_RATE = 60
+# bumped when the measurement changes, so cached recommendations are redone
+STUDY_VERSION = 3
+
+
+@dataclass
+class StudyResult:
+    integrator: str
+    n_steps: int
+    error: float  # max deviation from the reference in scene units
+    seconds: float
+
+
+@dataclass
+class Recommendation:
+    integrator: str
+    n_steps: int
+    error: float
+    tolerance: float
+
+    @property
+    def key(self) -> str:
+        return f"{self.integrator}:{self.n_steps}"
+
+    def get_integrator(self) -> Callable:
+        return get_integrator(self.integrator)
+
+
+def get_integrator(name: str) -> Callable:
+    return getattr(ode_solver, f"integrate_{name}")
+
+
+def _frame_states(solution: np.ndarray, t_end: float, n_steps: int, frame_times: np.ndarray) -> np.ndarray:
+    # solve() returns the state at i * dt for i in [0, n_steps], dt = t_end / (n_steps - 1),
+    # interpolated between the steps as with ode_solver.sample
+    state_times = np.arange(len(solution)) * (t_end / (n_steps - 1))
+    return np.stack([np.interp(frame_times, state_times, x) for x in solution.T], axis=1)
+
+
+def _solve(initial_state, times, integrator: str, derivative_func: Callable) -> np.ndarray:
+    if integrator == "rk4" and JIT_AVAILABLE and isinstance(derivative_func, Derivatives):
+        return solve_rk4(initial_state, times, derivative_func.derivatives, derivative_func.params)
+    return solve(initial_state, times, get_integrator(integrator), derivative_func)
+
+
+def _run(initial_state, t_end, derivative_func, to_scene, frame_times, reference, integrator, n_steps) -> StudyResult:
+    times = np.linspace(0, t_end, n_steps)
+    with np.errstate(all="ignore"):
+        # compilation of the native path is not a part of the cost
+        _solve(initial_state, times[:2], integrator, derivative_func)
+        started = time.perf_counter()
+        solution = _solve(initial_state, times, integrator, derivative_func)
+        seconds = time.perf_counter() - started
+
+    points = to_scene(_frame_states(solution, t_end, n_steps, frame_times))
+    error = np.linalg.norm(points - reference, axis=-1).max()
+    return StudyResult(integrator, n_steps, float(error) if np.isfinite(error) else np.inf, seconds)
+
+
+def convergence_study(initial_state,
+                      t_end: float,
+                      derivative_func: Callable,
+                      to_scene: Callable[[np.ndarray], np.ndarray],
+                      integrators: Sequence[str] = DEFAULT_INTEGRATORS,
+                      step_counts: Sequence[int] = DEFAULT_STEP_COUNTS,
+                      reference_steps: Optional[int] = None,
+                      processes: Optional[int] = None) -> List[StudyResult]:
+    """
+    :param derivative_func: as for solve(), picklable (module level function or class instance),
+        a jit.Derivatives for the native RK4
+    :param to_scene: maps (k, n) states to (k, ..., d) scene coordinates of what is drawn, picklable
+    :param integrators: names of ode_solver integrators, e.g. "rk4" for integrate_rk4
+    :param reference_steps: steps of the RK4 reference solution, 4 * max(step_counts) by default
+    :return: results of every integrator and step count
+    """
+    frame_times = np.linspace(0, t_end, int(t_end * FRAME_RATE) + 1)
+    reference_steps = reference_steps or 4 * max(step_counts)
+    logging.info(f"Solving the reference with {reference_steps} steps...")
+    reference = _solve(initial_state, np.linspace(0, t_end, reference_steps), "rk4", derivative_func)
+    reference = to_scene(_frame_states(reference, t_end, reference_steps, frame_times))
+
+    configs = [(integrator, n) for integrator in integrators for n in step_counts]
+    with ProcessPoolExecutor(processes) as pool:
+        futures = [pool.submit(_run, initial_state, t_end, derivative_func, to_scene, frame_times, reference,
+                               integrator, n) for integrator, n in configs]
+        results = [f.result() for f in futures]
+    for result in results:
+        logging.info(f"{result}")
+    _check_orders(results)
+    return results
+
+
+def _check_orders(results: List[StudyResult]) -> None:
+    # RK4 is more accurate than Euler at the same steps, unless the error is not the integration error
+    errors = {(r.integrator, r.n_steps): r.error for r in results}
+    for (integrator, n), error in errors.items():
+        euler_error = errors.get(("euler", n))
+        if integrator == "rk4" and euler_error is not None and np.isfinite(euler_error) and error >= euler_error:
+            logging.warning(f"RK4 error {error} is not below the Euler error {euler_error} with {n} steps, "
+                            f"the study doesn't measure the integration error")
+
+
+def cheapest(results: List[StudyResult], tolerance: float) -> Optional[StudyResult]:
+    """
+    :return: the fastest configuration with the error within the tolerance, None if there is none
+    """
+    accepted = [r for r in results if r.error <= tolerance]
+    return min(accepted, key=lambda r: r.seconds) if len(accepted) > 0 else None
+
+
+def recommend(initial_state,
+              t_end: float,
+              derivative_func: Callable,
+              to_scene: Callable[[np.ndarray], np.ndarray],
+              system_key: str,
+              tolerance: float,
+              integrators: Sequence[str] = DEFAULT_INTEGRATORS,
+              step_counts: Sequence[int] = DEFAULT_STEP_COUNTS,
+              processes: Optional[int] = None) -> Recommendation:
+    """
+    Cached convergence study, see convergence_study
+    :param system_key: describes everything the derivative function depends on, e.g. repr of the parameters
+    :param tolerance: maximum visual error in scene units
+    """
+    hasher = hashlib.sha256()
+    hasher.update(repr((system_key, np.asarray(initial_state, dtype=float).tolist(), float(t_end),
+                        float(tolerance), list(integrators), list(step_counts), FRAME_RATE,
+                        STUDY_VERSION)).encode())
+    path = CACHE_DIR / f"{hasher.hexdigest()[:16]}.json"
+    if path.exists():
+        return Recommendation(**json.loads(path.read_text()))
+
+    results = convergence_study(initial_state, t_end, derivative_func, to_scene, integrators, step_counts,
+                                processes=processes)
+    best = cheapest(results, tolerance)
+    if best is None:
+        raise ValueError(f"No configuration is within the tolerance {tolerance}, "
+                         f"the best error is {min(r.error for r in results)}")
+    recommendation = Recommendation(best.integrator, best.n_steps, best.error, tolerance)
+    logging.info(f"Recommended: {recommendation}")
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(f".{os.getpid()}.tmp")
+    tmp.write_text(json.dumps(asdict(recommendation), indent=2))
+    tmp.replace(path)
+    return recommendation
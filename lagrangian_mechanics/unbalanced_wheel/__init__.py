@@ -1,3 +1,4 @@
-from lagrangian_mechanics.unbalanced_wheel.params import ModelParams, SIMULATION_TIME, N_STEPS
+from lagrangian_mechanics.unbalanced_wheel.params import ModelParams, SIMULATION_TIME, N_STEPS, REST_AMPLITUDE, \
+    OUTRO_TIME, VISUAL_TOLERANCE
 from lagrangian_mechanics.unbalanced_wheel.simulation import Simulation
 from lagrangian_mechanics.unbalanced_wheel.geometry import Geometry
\ No newline at end of file
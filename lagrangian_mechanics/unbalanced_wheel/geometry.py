@@ -1,7 +1,7 @@
 from manim import *
 from numpy import sin, cos
 from primitives import SegmentedWheel, WheelAxis, CenterOfMass
-from lagrangian_mechanics.unbalanced_wheel import Simulation, SIMULATION_TIME, N_STEPS
+from lagrangian_mechanics.unbalanced_wheel import Simulation
 
 
 primary_params = {
@@ -84,9 +84,8 @@ class Geometry:
         r = self.r
         x_offset = self.x_offset
 
-        step = int(self.time.get_value() / SIMULATION_TIME * N_STEPS)
-        _th = self.model.thetas[step]
-        _pos = self.model.positions[step] + x_offset
+        _th = self.model.get_state(self.time.get_value())[0]
+        _pos = _th * R + x_offset
         _x, _y = r * sin(_th) + _pos, r * cos(_th)
         self.wheel.become(
             SegmentedWheel(radius=R, thickness=0.1, angle=-
@@ -105,9 +104,14 @@ class Geometry:
 
         self.point_of_contact.move_to(np.array((_pos, -R, 0)))
 
-    def animate(self, scene: Scene):
+    def animate(self, scene: Scene, t_start: float = 0, t_end: float = None):
+        """
+        Plays the simulation from t_start to t_end, until the wheel comes to rest by default
+        """
+        t_end = self.model.duration if t_end is None else t_end
+        self.time.set_value(t_start)
         self.moving_objects.add_updater(self._updater)
 
-        scene.play(self.time.animate.set_value(SIMULATION_TIME),
-                   run_time=SIMULATION_TIME,
+        scene.play(self.time.animate.set_value(t_end),
+                   run_time=t_end - t_start,
                    rate_func=rate_functions.linear)
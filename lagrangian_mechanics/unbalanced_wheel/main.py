@@ -22,12 +22,15 @@ Scenario:
     - animate the wheel
     - wait until motion stops, pause
 """
+import argparse
 import logging
 
 import numpy as np
 
-from lagrangian_mechanics.unbalanced_wheel import ModelParams, Simulation, Geometry
-from primitives import LAGRANGIAN_RAYLEIGH
+from lagrangian_mechanics.scenario import SectionedScenario, RenderPlan
+from lagrangian_mechanics.unbalanced_wheel import ModelParams, Simulation, Geometry, SIMULATION_TIME, \
+    REST_AMPLITUDE, OUTRO_TIME
+from primitives import LAGRANGIAN_RAYLEIGH, cached_math_tex, cached_text
 from manim import *
 
 
@@ -53,11 +56,18 @@ drawing_symbols_params = {
 }
 
 
-class Scenario(MovingCameraScene):
+class Scenario(SectionedScenario):
+    SECTIONS = [
+        "play_intro",
+        "play_draw_main_scene",
+        "play_draw_equations",
+        "animate_pendulum",
+        "play_outro"
+    ]
 
-    def __init__(self):
-        super().__init__()
-        self.model = Simulation(ModelParams())
+    def __init__(self, plan: RenderPlan = None, model: Simulation = None):
+        super().__init__(plan)
+        self.model = model or Simulation(ModelParams())
         self.geometry = Geometry(self.model)
         self.to_hide = []
 
@@ -106,6 +116,7 @@ class Scenario(MovingCameraScene):
                       secondary_font).next_to(line_sep, direction=RIGHT)
         self.play(Write(text_2))
         self.wait(1.5)
+        self.fade_out_all()
 
     def write_problem_description(self):
         text = """A mass m is attached to a weightless wheel
@@ -152,98 +163,98 @@ the friction coefficient is b."""
         }
 
         # Kinetic energy section
-        txt_1 = Text("1. Kinetic energy", **comment_font) \
+        txt_1 = cached_text("1. Kinetic energy", **comment_font) \
             .move_to(6.5 * UP + 5.5 * LEFT)
         self.play(Write(txt_1), run_time=1)
 
-        txt_2 = MathTex(r"v_x=\dot{\theta}rsin\theta+\dot{\theta}R", **math_font) \
+        txt_2 = cached_math_tex(r"v_x=\dot{\theta}rsin\theta+\dot{\theta}R", **math_font) \
             .next_to(txt_1, 2 * DOWN) \
             .align_to(txt_1, LEFT)
         self.play(Write(txt_2), run_time=1)
         self.wait(0.5)
 
-        txt_3 = MathTex(r"v_y=-\dot{\theta}rcos\theta", **math_font) \
+        txt_3 = cached_math_tex(r"v_y=-\dot{\theta}rcos\theta", **math_font) \
             .next_to(txt_2, DOWN) \
             .align_to(txt_2, LEFT)
         self.play(Write(txt_3), run_time=1)
         self.wait(0.5)
 
-        txt_4 = MathTex(r"v^2=\dot{\theta}^2(r^2+R^2+2rRsin\theta)", **math_font) \
+        txt_4 = cached_math_tex(r"v^2=\dot{\theta}^2(r^2+R^2+2rRsin\theta)", **math_font) \
             .next_to(txt_3, DOWN) \
             .align_to(txt_3, LEFT)
         self.play(Write(txt_4), run_time=1)
         self.wait(0.5)
 
-        txt_5 = MathTex(r"T=\frac{1}{2}m\dot{\theta}^2(r^2+R^2+2rRsin\theta)", **math_font) \
+        txt_5 = cached_math_tex(r"T=\frac{1}{2}m\dot{\theta}^2(r^2+R^2+2rRsin\theta)", **math_font) \
             .next_to(txt_4, DOWN) \
             .align_to(txt_4, LEFT)
         self.play(Write(txt_5), run_time=1)
         self.wait(1)
 
         # Potential energy section
-        txt_6 = Text("2. Potential energy", **comment_font) \
+        txt_6 = cached_text("2. Potential energy", **comment_font) \
             .move_to(6.5 * UP + LEFT)
         self.play(Write(txt_6), run_time=1)
 
-        txt_7 = MathTex(r"V=mg(R+rcos\theta)", **math_font) \
+        txt_7 = cached_math_tex(r"V=mg(R+rcos\theta)", **math_font) \
             .next_to(txt_6, 2 * DOWN) \
             .align_to(txt_6, LEFT)
         self.play(Write(txt_7), run_time=1)
         self.wait(0.5)
 
         # Rayleigh energy dissipation function
-        txt_8 = Text("3. Rayleigh dissipation", **comment_font) \
+        txt_8 = cached_text("3. Rayleigh dissipation", **comment_font) \
             .next_to(txt_7, 2 * DOWN) \
             .align_to(txt_7, LEFT)
         self.play(Write(txt_8), run_time=1)
         self.wait(0.5)
 
-        txt_9 = MathTex(r"D=\frac{1}{2}{\dot{\theta}^2}b", **math_font) \
+        txt_9 = cached_math_tex(r"D=\frac{1}{2}{\dot{\theta}^2}b", **math_font) \
             .next_to(txt_8, 2 * DOWN) \
             .align_to(txt_8, LEFT)
         self.play(Write(txt_9), run_time=1)
         self.wait(1)
 
         # Deriving equations of motion
-        txt_10 = Text("4. Equations of motion", **comment_font) \
+        txt_10 = cached_text("4. Equations of motion", **comment_font) \
           .move_to(6.5 * UP + 3 * RIGHT)
         self.play(Write(txt_10), run_time=1)
 
-        txt_11 = MathTex(r"\mathcal{L}=\frac{1}{2}m\dot{\theta}^2(r^2+R^2+2rRsin\theta)-\\-mg(R+rcos\theta)", **math_font) \
+        txt_11 = cached_math_tex(r"\mathcal{L}=\frac{1}{2}m\dot{\theta}^2(r^2+R^2+2rRsin\theta)-\\-mg(R+rcos\theta)", **math_font) \
             .next_to(txt_10, 2 * DOWN) \
             .align_to(txt_10, LEFT)
         self.play(Write(txt_11), run_time=1)
         self.wait(0.5)
 
-        txt_12 = MathTex(LAGRANGIAN_RAYLEIGH, **math_font) \
+        txt_12 = cached_math_tex(LAGRANGIAN_RAYLEIGH, **math_font) \
             .next_to(txt_11, DOWN) \
             .align_to(txt_11, LEFT)
         self.play(Write(txt_12), run_time=1)
         self.wait(0.5)
 
         f = r"\frac{\partial\mathcal{L}}{\partial\dot\theta}=m\dot\theta(r^2+R^2+2rRsin\theta)"
-        txt_13 = MathTex(f, **math_font) \
+        txt_13 = cached_math_tex(f, **math_font) \
             .next_to(txt_12, DOWN) \
             .align_to(txt_12, LEFT)
         self.play(Write(txt_13), run_time=1)
         self.wait(0.5)
 
         f = r"\frac{d}{dt}\left(\frac{\partial \mathcal{L}}{\partial\dot{\theta}}\right)=m\ddot\theta(r^2+R^2+2rRsin\theta)+\\+2rRm{{\theta}^2}cos\theta"
-        txt_14 = MathTex(f, **math_font) \
+        txt_14 = cached_math_tex(f, **math_font) \
             .next_to(txt_13, DOWN) \
             .align_to(txt_13, LEFT)
         self.play(Write(txt_14), run_time=2)
         self.wait(0.5)
 
         f = r"\frac{\partial \mathcal{L}}{\partial\theta}=rRm{\dot\theta^2}cos\theta+mgrsin\theta"
-        txt_15 = MathTex(f, **math_font) \
+        txt_15 = cached_math_tex(f, **math_font) \
             .next_to(txt_14, DOWN) \
             .align_to(txt_14, LEFT)
         self.play(Write(txt_15), run_time=1)
         self.wait(0.5)
 
         f = r"\ddot\theta(r^2+R^2+2rRsin\theta)+rR{\dot\theta^2}cos\theta-\\-grsin\theta+\dot{\theta}\frac{b}{m}=0"
-        txt_16 = MathTex(f, **math_font) \
+        txt_16 = cached_math_tex(f, **math_font) \
             .next_to(txt_15, DOWN) \
             .align_to(txt_15, LEFT)
         self.play(Write(txt_16), run_time=2)
@@ -259,7 +270,7 @@ the friction coefficient is b."""
 x={\theta}R
 \end{cases}
         """
-        text_final_eq = MathTex(f, **math_font_large) \
+        text_final_eq = cached_math_tex(f, **math_font_large) \
             .next_to(txt_16, 1.2 * DOWN) \
             .align_to(txt_16, LEFT)
         self.play(Write(text_final_eq), run_time=3)
@@ -280,21 +291,44 @@ x={\theta}R
 
 
     def animate_pendulum(self):
-        self.geometry.animate(self)
+        self.geometry.animate(self, *self.get_time_range(self.model.duration))
+
+    def play_outro(self):
+        # the animation ends when the wheel comes to rest, the outro shows it still for OUTRO_TIME in total
+        if self.model.rest_time is None:
+            logging.warning(f"The wheel doesn't come to rest in {SIMULATION_TIME}s, it stops in motion")
+            self.wait(OUTRO_TIME)
+        else:
+            self.wait(max(OUTRO_TIME - (self.model.duration - self.model.rest_time), 0))
 
     def fade_out_all(self):
         self.play(*[FadeOut(obj) for obj in self.mobjects])
 
-    def construct(self):
-        self.play_intro()
-        self.fade_out_all()
-        self.play_draw_main_scene()
-        self.play_draw_equations()
-        self.animate_pendulum()
-        self.wait(5)
-
 
 if __name__ == "__main__":
-    scene = Scenario()
+    parser = argparse.ArgumentParser(description="Renders the unbalanced wheel video")
+    parser.add_argument("--sections", nargs="+", choices=Scenario.SECTIONS,
+                        help="re-render these sections, the rest are taken from the checkpoint")
+    parser.add_argument("--from-time", type=float, default=0,
+                        help="start of the simulation time range to render, seconds")
+    parser.add_argument("--to-time", type=float, default=None,
+                        help="end of the simulation time range to render, seconds")
+    parser.add_argument("--resume", action="store_true",
+                        help="reuse sections completed by the previous render")
+    parser.add_argument("--tune", action="store_true",
+                        help="pick the integrator and the number of steps by a convergence study")
+    args = parser.parse_args()
+
+    model = Simulation(ModelParams())
+    if args.tune:
+        model.tune()
+
+    plan = RenderPlan(
+        sections=args.sections,
+        t_start=args.from_time,
+        t_end=args.to_time,
+        resume=args.resume,
+        signature=f"{ModelParams()}|{SIMULATION_TIME}|{model.get_config_key()}|{REST_AMPLITUDE}")
+    scene = Scenario(plan, model)
 
     scene.render()
@@ -2,8 +2,19 @@ from dataclasses import dataclass
 
 g = 9.81
 
-N_STEPS = 12000
-SIMULATION_TIME = 24
+N_STEPS = 30000
+# the horizon of the simulation, it stops earlier when the wheel comes to rest
+SIMULATION_TIME = 60
+
+# the wheel is at rest when its energy above the rest position is that of an oscillation with
+# the amplitude below REST_AMPLITUDE radians, in about 46s with the default parameters
+REST_AMPLITUDE = 0.03
+
+# the wheel is shown at rest for OUTRO_TIME seconds at the end of the video
+OUTRO_TIME = 3.0
+
+# maximum visual error of the simulation in scene units, used by Simulation.tune
+VISUAL_TOLERANCE = 0.005
 
 @dataclass
 class ModelParams:
@@ -1,35 +1,241 @@
 import logging
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
 import numpy as np
 from numpy import pi as PI, sin, cos
-from lagrangian_mechanics.unbalanced_wheel.params import ModelParams, N_STEPS, SIMULATION_TIME, g
-from lagrangian_mechanics.solver.ode_solver import solve, integrate_rk4
+from lagrangian_mechanics.unbalanced_wheel.params import ModelParams, N_STEPS, SIMULATION_TIME, REST_AMPLITUDE, \
+    VISUAL_TOLERANCE, g
+from lagrangian_mechanics.solver.ode_solver import Event, solve, solve_with_events, integrate_euler, integrate_heuns, integrate_rk4, \
+    integrate_semi_implicit_euler, integrate_velocity_verlet, integrate_leapfrog, integrate_backward_euler, \
+    integrate_radau, sample
+from lagrangian_mechanics.solver.jit import JIT_AVAILABLE, Derivatives, jit, solve_rk4_with_events
+from lagrangian_mechanics.solver.tuning import Recommendation, recommend
+
+INTEGRATORS = {
+    "euler": integrate_euler,
+    "heuns": integrate_heuns,
+    "rk4": integrate_rk4,
+    "semi_implicit_euler": integrate_semi_implicit_euler,
+    "velocity_verlet": integrate_velocity_verlet,
+    "leapfrog": integrate_leapfrog,
+    "backward_euler": integrate_backward_euler,
+    "radau": integrate_radau,
+}
+
+
+@jit
+def derivatives(state, t, params):
+    """
+    Equations of motion in the restricted style of solver.jit
+    :param params: [g * r, r * R, b / m, r^2 + R^2, 2 * r * R]
+    """
+    gr, rR, damping, r2_R2, rR2 = params[0], params[1], params[2], params[3], params[4]
+    th, w = state[0], state[1]
+    s = sin(th)
+    out = np.empty(2)
+    out[0] = w
+    out[1] = (gr * s - rR * w ** 2 * cos(th) - w * damping) / (r2_R2 + rR2 * s)
+    return out
+
+
+class ScenePoints:
+    """
+    Maps states to the scene positions of the wheel center and the center of mass, for the tuning
+    """
+
+    def __init__(self, params: ModelParams):
+        self.r = params.r
+        self.R = params.R
+
+    def __call__(self, states: np.ndarray) -> np.ndarray:
+        th = states[:, 0]
+        x = th * self.R
+        return np.stack((
+            np.stack((x, np.zeros_like(x)), axis=1),
+            np.stack((x + self.r * sin(th), self.r * cos(th)), axis=1)
+        ), axis=1)
+
+
+class AtRest(Event):
+    """
+    Terminal event: the energy above the rest position drops below the energy of an oscillation
+    with the given amplitude. Unlike the velocity, the energy only decreases with damping,
+    so it doesn't fire at the turning points of slow swings.
+    """
+    terminal = True
+    direction = -1
+
+    def __init__(self, params: ModelParams, amplitude: float):
+        self.params = params
+        self.threshold = 0.5 * params.m * g * params.r * amplitude ** 2
+
+    def __call__(self, t, state):
+        r, R, m = self.params.r, self.params.R, self.params.m
+        th, w = state[0], state[1]
+        kinetic = 0.5 * m * w ** 2 * (r ** 2 + R ** 2 + 2 * r * R * sin(th))
+        return kinetic + m * g * r * (1 + cos(th)) - self.threshold
+
+
+@dataclass
+class DriftReport:
+    integrator: str
+    n_steps: int
+    max_drift: float
+    final_drift: float
+    seconds: float
 
 
 class Simulation:
-    def __init__(self, params: ModelParams, initial_th: float = 3 * PI / 5):
+    def __init__(self, params: ModelParams, initial_th: float = 3 * PI / 5, n_steps: int = N_STEPS):
         self.params = params
         self.initial_th = initial_th
+        self.integrate_func = integrate_rk4
 
-        self.times = np.linspace(0, SIMULATION_TIME, N_STEPS)
+        self.times = np.linspace(0, SIMULATION_TIME, n_steps)
+        self.dt = self.times[1] - self.times[0]
+        self.duration = SIMULATION_TIME
+        self.rest_time = None
         self.solution = []
         self.thetas = []
         self.positions = []
 
-    def solve_model(self):
-        def derivatives(state, step, t, dt):
-            r, R, b = self.params.r, self.params.R, self.params.b
-            [_th, _w] = state
-            return [_w,
-                    (g * r * sin(_th) - r * R * _w ** 2 * cos(_th) - _w * b) / (r ** 2 + R ** 2 + 2 * r * R * sin(_th))]
+        # diagnostics, see compute_diagnostics
+        self.omegas = []
+        self.kinetic = []
+        self.potential = []
+        self.dissipated = []
+        self.contact_velocities = []
+        self.energy_drift = []
 
-        logging.info("Solving equations...")
-        self.solution = solve(
+    def _get_params(self) -> np.ndarray:
+        r, R, m, b = self.params.r, self.params.R, self.params.m, self.params.b
+        return np.array([g * r, r * R, b / m, r ** 2 + R ** 2, 2 * r * R])
+
+    def _get_derivatives(self):
+        params = self._get_params()
+        if not JIT_AVAILABLE:
+            # plain Python floats are faster than small arrays in interpreted code
+            params = params.tolist()
+
+        def _derivatives(state, step, t, dt):
+            return derivatives(np.asarray(state, dtype=float) if JIT_AVAILABLE else state, t, params)
+
+        return _derivatives
+
+    def _solve(self, integrate_func) -> np.ndarray:
+        return solve(
             np.array([self.initial_th, 0]),
             self.times,
-            integrate_rk4,
-            derivatives
+            integrate_func,
+            self._get_derivatives()
         )
-        logging.info(f"Solved: {len(self.solution)} steps")
+
+    def get_config_key(self) -> str:
+        """
+        Integrator and number of steps, to be a part of the render signature
+        """
+        return f"{self.integrate_func.__name__}:{len(self.times)}"
+
+    def tune(self, tolerance: float = VISUAL_TOLERANCE) -> Recommendation:
+        """
+        Picks the cheapest integrator and number of steps within the visual tolerance, see solver.tuning
+        """
+        recommendation = recommend(
+            np.array([self.initial_th, 0]),
+            SIMULATION_TIME,
+            Derivatives(derivatives, self._get_params()),
+            ScenePoints(self.params),
+            repr((self.params, self.initial_th)),
+            tolerance)
+        self.integrate_func = recommendation.get_integrator()
+        self.times = np.linspace(0, SIMULATION_TIME, recommendation.n_steps)
+        self.dt = self.times[1] - self.times[0]
+        return recommendation
+
+    def solve_model(self, integrate_func=None):
+        """
+        Solves until the wheel comes to rest or SIMULATION_TIME is over
+        :param integrate_func: RK4 or the integrator picked by tune() by default
+        """
+        integrate_func = integrate_func or self.integrate_func
+        logging.info("Solving equations...")
+        initial_state = np.array([self.initial_th, 0])
+        events = [AtRest(self.params, REST_AMPLITUDE)]
+        if integrate_func is integrate_rk4 and JIT_AVAILABLE:
+            self.solution, occurrences = solve_rk4_with_events(
+                initial_state, self.times, derivatives, self._get_params(), events)
+        else:
+            self.solution, occurrences = solve_with_events(
+                initial_state, self.times, integrate_func, self._get_derivatives(), events)
+        self.duration = min((len(self.solution) - 1) * self.dt, SIMULATION_TIME)
+        self.rest_time = occurrences[0].t if len(occurrences) > 0 else None
+        logging.info(f"Solved: {len(self.solution)} steps, {self.duration:.2f}s")
 
         self.thetas = self.solution[:, 0]
         self.positions = self.thetas * self.params.R
+        self.compute_diagnostics()
+
+    def get_state(self, t: float) -> np.ndarray:
+        """
+        :return: the state at the time t, interpolated between the steps
+        """
+        return sample(self.solution, self.times, t)
+
+    def get_energies(self, thetas: np.ndarray, omegas: np.ndarray) -> (np.ndarray, np.ndarray, np.ndarray):
+        """
+        Kinetic energy T, potential energy V and accumulated dissipated energy
+        (integral of the Rayleigh dissipation power 2D) along a trajectory
+        """
+        r, R, m, b = self.params.r, self.params.R, self.params.m, self.params.b
+        dt = self.dt
+
+        w2 = omegas ** 2
+        kinetic = 0.5 * m * w2 * (r ** 2 + R ** 2 + 2 * r * R * sin(thetas))
+        potential = m * g * (R + r * cos(thetas))
+        power = b * w2
+        dissipated = np.zeros_like(power)
+        np.cumsum((power[1:] + power[:-1]) * (dt / 2), out=dissipated[1:])
+        return kinetic, potential, dissipated
+
+    def get_energy_drift(self, solution: np.ndarray) -> np.ndarray:
+        """
+        Violation of the energy balance T + V + dissipated = const relative to the initial energy
+        """
+        kinetic, potential, dissipated = self.get_energies(solution[:, 0], solution[:, 1])
+        total = kinetic + potential + dissipated
+        return (total - total[0]) / total[0]
+
+    def compute_diagnostics(self):
+        self.omegas = self.solution[:, 1]
+        self.kinetic, self.potential, self.dissipated = self.get_energies(self.thetas, self.omegas)
+        self.contact_velocities = self.omegas * self.params.R
+        self.energy_drift = self.get_energy_drift(self.solution)
+
+    def energy_drift_report(self, integrators: Optional[Dict] = None) -> List[DriftReport]:
+        """
+        Solves the model with each integrator and measures the energy drift
+        :param integrators: name -> integrate function, all available integrators by default
+        :return: reports sorted by solving time
+        """
+        reports = []
+        for name, integrate_func in (integrators or INTEGRATORS).items():
+            started = time.perf_counter()
+            solution = self._solve(integrate_func)
+            seconds = time.perf_counter() - started
+
+            drift = np.abs(self.get_energy_drift(solution))
+            reports.append(DriftReport(name, len(solution), float(drift.max()), float(drift[-1]), seconds))
+            logging.info(f"{reports[-1]}")
+        return sorted(reports, key=lambda report: report.seconds)
+
+    def cheapest_integrator(self, drift_budget: float, integrators: Optional[Dict] = None) -> Optional[DriftReport]:
+        """
+        :param drift_budget: maximum allowed relative energy drift
+        :return: the fastest integrator within the budget or None
+        """
+        for report in self.energy_drift_report(integrators):
+            if report.max_drift <= drift_budget:
+                return report
+        return None
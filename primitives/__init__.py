@@ -1,3 +1,10 @@
+from primitives.block_grid import BlockGrid
 from primitives.center_of_mass import CenterOfMass
+from primitives.dashed_circle import DashedCircle
+from primitives.fading_trail import FadingTrail
+from primitives.glare import GlareText, Glare
+from primitives.glow import Glow
+from primitives.particle_cloud import ParticleCloud
 from primitives.segmented_wheel import SegmentedWheel, WheelAxis
-from primitives.latex import LAGRANGIAN, LAGRANGIAN_RAYLEIGH
\ No newline at end of file
+from primitives.latex import LAGRANGIAN, LAGRANGIAN_RAYLEIGH, FORMULAS
+from primitives.tex_cache import cached_math_tex, cached_text, precompile, prewarm
@@ -0,0 +1,29 @@
+from manim import *
+
+
+class BlockGrid(ImageMobject):
+    """
+    Grid of solid color blocks drawn as one image with a pixel per block, upscaled without smoothing.
+    The opacities of all the blocks are set at once from an array, so an update costs the same
+    as for one block and large grids animate as one mobject.
+    """
+
+    def __init__(self, colors, cell_size: float = 1.0, opacity: float = 0.0, **kwargs):
+        """
+        :param colors: rows of colors, the first row is on the top
+        :param cell_size: side of a block in scene units
+        """
+        rgb = np.array([[color_to_int_rgb(color) for color in row] for row in colors], dtype=np.uint8)
+        rgba = np.empty(rgb.shape[:2] + (4,), dtype=np.uint8)
+        rgba[..., :3] = rgb
+        rgba[..., 3] = round(255 * opacity)
+        kwargs.setdefault("resampling_algorithm", RESAMPLING_ALGORITHMS["nearest"])
+        super().__init__(rgba, **kwargs)
+        self.height = rgba.shape[0] * cell_size
+
+    def set_opacities(self, opacities: np.ndarray) -> "BlockGrid":
+        """
+        :param opacities: (rows, cols) opacities of the blocks in [0, 1], the first row is on the top
+        """
+        self.pixel_array[:, :, 3] = np.round(np.clip(opacities, 0, 1) * 255)
+        return self
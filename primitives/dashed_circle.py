@@ -0,0 +1,22 @@
+from manim import *
+
+
+class DashedCircle(DashedVMobject):
+    """
+    Dashed circle which is built once and then only translated: the dashes are cut from the circle
+    in the constructor, move_center_to shifts the existing points by the offset of the center.
+    """
+
+    def __init__(self, radius: float = 1, num_dashes: int = 128, center=ORIGIN, **kwargs):
+        """
+        :param kwargs: style of the circle, e.g. stroke_color, stroke_width
+        """
+        super().__init__(Circle(radius=radius, **kwargs), num_dashes=num_dashes)
+        self.circle_center = np.array(ORIGIN, dtype=float)
+        self.move_center_to(center)
+
+    def move_center_to(self, point) -> "DashedCircle":
+        point = np.asarray(point, dtype=float)
+        self.shift(point - self.circle_center)
+        self.circle_center = point.copy()
+        return self
@@ -0,0 +1,56 @@
+from manim import *
+
+
+class FadingTrail(VGroup):
+    """
+    Trajectory of the last `length` positions stored in a fixed-size ring buffer.
+    The trail is drawn as `n_bands` consecutive polylines with opacity growing from the tail
+    to the head (n_bands = length - 1 gives per-vertex opacity), so the cost of an update
+    is constant regardless of the duration of the video.
+    """
+
+    def __init__(self,
+                 length: int = 256,
+                 n_bands: int = 16,
+                 color: str = WHITE,
+                 stroke_width: float = 2,
+                 **kwargs):
+        super().__init__(**kwargs)
+        self.buffer = np.zeros((length, 3))
+        self.head = 0
+        self.size = 0
+
+        opacities = np.linspace(0, 1, n_bands + 1)[1:]
+        self.bands = [VMobject(stroke_color=color, stroke_width=stroke_width, stroke_opacity=opacity)
+                      for opacity in opacities]
+        self.add(*self.bands)
+
+    def reset(self) -> "FadingTrail":
+        self.head = 0
+        self.size = 0
+        for band in self.bands:
+            band.clear_points()
+        return self
+
+    def get_ordered_points(self) -> np.ndarray:
+        """
+        :return: stored positions from the oldest to the newest
+        """
+        if self.size < len(self.buffer):
+            return self.buffer[:self.size]
+        return np.concatenate((self.buffer[self.head:], self.buffer[:self.head]))
+
+    def push(self, point: np.ndarray) -> "FadingTrail":
+        self.buffer[self.head] = point
+        self.head = (self.head + 1) % len(self.buffer)
+        self.size = min(self.size + 1, len(self.buffer))
+
+        points = self.get_ordered_points()
+        bounds = np.linspace(0, len(points) - 1, len(self.bands) + 1).astype(int)
+        for band, start, end in zip(self.bands, bounds[:-1], bounds[1:]):
+            if end > start:
+                # neighbouring bands share a vertex to keep the polyline continuous
+                band.set_points_as_corners(points[start:end + 1])
+            else:
+                band.clear_points()
+        return self
@@ -0,0 +1,85 @@
+from functools import lru_cache
+
+from manim import *
+
+
+@lru_cache(maxsize=32)
+def get_text_mask(text: str, font: str, font_size: float, pixels_per_unit: float, buff: float) -> np.ndarray:
+    """
+    Rasterizes the text once with a transparent camera fitted to it
+    :param buff: margin around the text in scene units
+    :return: (h, w) read-only coverage of the pixels by the glyphs, uint8
+    """
+    mob = Text(text, font=font, font_size=font_size, color=WHITE).move_to(ORIGIN)
+    width, height = mob.width + 2 * buff, mob.height + 2 * buff
+    camera = Camera(pixel_width=int(np.ceil(width * pixels_per_unit)),
+                    pixel_height=int(np.ceil(height * pixels_per_unit)),
+                    frame_width=width, frame_height=height, background_opacity=0)
+    camera.capture_mobject(mob)
+    mask = camera.pixel_array[:, :, 3].copy()
+    mask.setflags(write=False)
+    return mask
+
+
+class GlareText(ImageMobject):
+    """
+    Text with a glare band moving across it. The glyphs are rasterized once into the alpha channel
+    and the colors of every position of the band are precomputed as one strip wider than the text,
+    so a frame copies a window of the strip into the image: the cost is constant in the number of glyphs.
+    """
+
+    def __init__(self,
+                 text: str,
+                 font: str = "",
+                 font_size: float = DEFAULT_FONT_SIZE,
+                 color: str = WHITE,
+                 glare_color: str = WHITE,
+                 glare_opacity: float = 0.8,
+                 band_width: float = 0.5,
+                 slant: float = 0.5,
+                 buff: float = 0.05,
+                 **kwargs):
+        """
+        :param band_width: width of the glare band in scene units
+        :param slant: horizontal shift of the band per unit of the height, 0 for a vertical band
+        """
+        pixels_per_unit = config.pixel_height / config.frame_height
+        mask = get_text_mask(text, font, font_size, pixels_per_unit, buff)
+        h, w = mask.shape
+
+        # the text shows the columns [s, s + w) of the strip at the step s of the sweep
+        half_band = band_width * pixels_per_unit / 2
+        slant_span = slant * (h - 1)
+        start, end = -half_band, w - 1 + slant_span + half_band
+        self.travel = int(np.ceil(end - start))
+        d = np.arange(w + self.travel)[np.newaxis, :] + slant * np.arange(h)[:, np.newaxis] - end
+        profile = glare_opacity * np.cos(np.clip(d / half_band, -1, 1) * PI / 2) ** 2
+        base, glare = color_to_int_rgb(color), color_to_int_rgb(glare_color)
+        self.strip = np.round(base + (glare - base) * profile[..., np.newaxis]).astype(np.uint8)
+
+        rgba = np.empty((h, w, 4), dtype=np.uint8)
+        rgba[..., :3] = base
+        rgba[..., 3] = mask
+        super().__init__(rgba, **kwargs)
+        self.height = h / pixels_per_unit
+        self.set_glare(0)
+
+    def set_glare(self, alpha: float) -> "GlareText":
+        """
+        :param alpha: position of the band, it is off the text on the left at 0 and on the right at 1
+        """
+        s = int(round((1 - alpha) * self.travel))
+        self.pixel_array[:, :, :3] = self.strip[:, s:s + self.pixel_array.shape[1]]
+        return self
+
+
+class Glare(Animation):
+    """
+    Sweeps the glare of a GlareText from the left to the right
+    """
+
+    def __init__(self, mobject: GlareText, run_time: float = 1.0, **kwargs):
+        super().__init__(mobject, run_time=run_time, **kwargs)
+
+    def interpolate_mobject(self, alpha: float) -> None:
+        self.mobject.set_glare(self.rate_func(alpha))
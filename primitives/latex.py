@@ -3,3 +3,9 @@ LAGRANGIAN = \
 
 LAGRANGIAN_RAYLEIGH = \
     r"\frac{d}{dt}\left(\frac{\partial \mathcal{L}}{\partial\dot{\theta}}\right)-\frac{\partial \mathcal{L}}{\partial\theta}+\frac{\partial D}{\partial{\dot\theta}}=0"
+
+# manifest of formulas shared by the videos, compiled by the pre-pass before rendering
+FORMULAS = [
+    LAGRANGIAN,
+    LAGRANGIAN_RAYLEIGH
+]
@@ -0,0 +1,39 @@
+from manim import *
+
+
+class ParticleCloud(PMobject):
+    """
+    Thousands of particles drawn as one point cloud instead of a Dot per particle.
+    Colors are set once, an update only replaces the positions.
+    """
+
+    def __init__(self,
+                 positions: np.ndarray,
+                 color: str = WHITE,
+                 opacity: float = 1.0,
+                 stroke_width: float = 2,
+                 **kwargs):
+        """
+        :param positions: (n, 3) initial positions
+        :param stroke_width: size of a particle in pixels
+        """
+        super().__init__(stroke_width=stroke_width, **kwargs)
+        self.add_points(np.array(positions, dtype=float), color=color, alpha=opacity)
+
+    def set_positions(self, positions: np.ndarray) -> "ParticleCloud":
+        """
+        :param positions: (n, 3) positions, copied into the points of the cloud
+        """
+        self.points[:] = positions
+        return self
+
+    def set_colors_by_values(self, values: np.ndarray, low_color: str = BLUE, high_color: str = RED,
+                             opacity: float = 1.0) -> "ParticleCloud":
+        """
+        Colors particles by a per particle quantity, e.g. kinetic energy
+        """
+        low, high = np.array(color_to_rgba(low_color, opacity)), np.array(color_to_rgba(high_color, opacity))
+        span = np.ptp(values) or 1.0
+        alpha = ((values - np.min(values)) / span)[:, np.newaxis]
+        self.rgbas = low + (high - low) * alpha
+        return self
@@ -0,0 +1,131 @@
+"""
+Persistent cache of compiled MathTex and Text mobjects, shared across scenes and runs.
+
+A mobject is built once per content hash of its class, arguments and tex template,
+then pickled into CACHE_DIR and copied on every later request. Intermediate LaTeX and
+Pango files are written to the same directory, so identical formulas used in different
+videos are compiled only once.
+"""
+import hashlib
+import logging
+import os
+import pickle
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Iterable, List, Optional, Tuple
+
+import manim
+from manim import *
+
+CACHE_DIR = Path(os.environ.get("INNER_NERD_TEX_CACHE", Path.home() / ".cache" / "inner-nerd" / "tex"))
+
+_mobjects = {}
+
+
+def shared_dirs():
+    """
+    Context in which LaTeX and Pango files are written to the cache, the global config is restored after it
+    """
+    return tempconfig({"tex_dir": str(CACHE_DIR / "Tex"), "text_dir": str(CACHE_DIR / "texts")})
+
+
+def get_key(cls: type, args: tuple, kwargs: dict) -> str:
+    template = kwargs.get("tex_template") or config["tex_template"]
+    options = sorted((k, v) for k, v in kwargs.items() if k != "tex_template")
+    id_str = repr((manim.__version__, cls.__name__, args, options, template.body))
+    return hashlib.sha256(id_str.encode()).hexdigest()[:16]
+
+
+def _get_path(key: str) -> Path:
+    return CACHE_DIR / "mobjects" / f"{key}.pickle"
+
+
+def _load(path: Path) -> Optional[Mobject]:
+    try:
+        return pickle.loads(path.read_bytes())
+    except Exception as e:
+        # unpickling of stale or incompatible files can raise about anything, they are just rebuilt
+        logging.warning(f"Failed to load cached mobject {path}: {e}")
+        return None
+
+
+def _store(path: Path, mobject: Mobject) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(f".{os.getpid()}.tmp")
+    try:
+        tmp.write_bytes(pickle.dumps(mobject, protocol=pickle.HIGHEST_PROTOCOL))
+        tmp.replace(path)
+    except (pickle.PicklingError, TypeError, AttributeError) as e:
+        logging.warning(f"Mobject {mobject} cannot be cached: {e}")
+        tmp.unlink(missing_ok=True)
+
+
+def cached(cls: type, *args, **kwargs) -> Mobject:
+    """
+    Returns a copy of a cached mobject, builds and caches it on a miss
+    :param cls: mobject class, e.g. MathTex or Text
+    :param args: positional arguments of the class
+    :param kwargs: keyword arguments of the class
+    :return: new instance of the mobject
+    """
+    key = get_key(cls, args, kwargs)
+    if key not in _mobjects:
+        path = _get_path(key)
+        mobject = _load(path) if path.exists() else None
+        if mobject is None:
+            with shared_dirs():
+                mobject = cls(*args, **kwargs)
+            _store(path, mobject)
+        _mobjects[key] = mobject
+    return _mobjects[key].copy()
+
+
+def cached_math_tex(*tex_strings: str, **kwargs) -> MathTex:
+    return cached(MathTex, *tex_strings, **kwargs)
+
+
+def cached_text(text: str, **kwargs) -> Text:
+    return cached(Text, text, **kwargs)
+
+
+def _compile_math_tex(tex: str, variants: List[dict]) -> None:
+    for kwargs in variants:
+        cached_math_tex(tex, **kwargs)
+
+
+def precompile(formulas: Iterable[Tuple[str, dict]], processes: Optional[int] = None) -> int:
+    """
+    Compiles formulas missing in the cache in a process pool
+    :param formulas: pairs of a tex string and keyword arguments of MathTex
+    :param processes: number of worker processes, defaults to the number of cores
+    :return: number of compiled formulas
+    """
+    missing = {}
+    for tex, kwargs in formulas:
+        key = get_key(MathTex, (tex,), kwargs)
+        if key not in _mobjects and not _get_path(key).exists():
+            missing[key] = (tex, kwargs)
+    if len(missing) == 0:
+        return 0
+
+    # variants of the same source write the same LaTeX files, so they are compiled by one worker
+    variants = {}
+    for tex, kwargs in missing.values():
+        variants.setdefault(tex, []).append(kwargs)
+
+    logging.info(f"Compiling {len(missing)} formulas...")
+    with ProcessPoolExecutor(processes) as pool:
+        list(pool.map(_compile_math_tex, variants.keys(), variants.values()))
+    return len(missing)
+
+
+def prewarm(formulas: Iterable[str], processes: Optional[int] = None, **kwargs) -> int:
+    """
+    Compiles formulas missing in the cache in a process pool
+    :param formulas: tex strings
+    :param processes: number of worker processes, defaults to the number of cores
+    :param kwargs: keyword arguments of MathTex the formulas will be requested with
+    :return: number of compiled formulas
+    """
+    return precompile([(f, kwargs) for f in formulas], processes)
+
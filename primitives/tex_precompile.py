@@ -0,0 +1,137 @@
+"""
+Pre-pass which compiles every cached MathTex of a scenario in a process pool before rendering.
+
+Formulas are collected from the scenario source without running it: arguments of
+cached_math_tex calls are resolved from string literals, local and module
+constants, names imported from primitives and manim constants. Plain MathTex calls don't
+read the cache, so they are not collected. Formulas declared in
+the primitives.latex manifest and not found in the scenario are included with default arguments.
+
+Usage: python -m primitives.tex_precompile lagrangian_mechanics/unbalanced_wheel/main.py
+"""
+import argparse
+import ast
+import importlib
+import logging
+import operator
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+import manim
+from primitives.latex import FORMULAS
+from primitives.tex_cache import precompile
+
+TEX_CALLS = {"cached_math_tex"}
+
+_BIN_OPS = {
+    ast.Add: operator.add,
+    ast.Mult: operator.mul,
+    ast.Sub: operator.sub,
+    ast.Div: operator.truediv,
+}
+
+
+class Unresolved(Exception):
+    pass
+
+
+def evaluate(node: ast.AST, env: dict):
+    """
+    Evaluates a constant expression; anything but literals, names and arithmetic is unresolved
+    """
+    if isinstance(node, ast.Constant):
+        return node.value
+    if isinstance(node, ast.Name):
+        if node.id in env:
+            return env[node.id]
+        if hasattr(manim, node.id):
+            return getattr(manim, node.id)
+        raise Unresolved(node.id)
+    if isinstance(node, (ast.List, ast.Tuple)):
+        return [evaluate(e, env) for e in node.elts]
+    if isinstance(node, ast.Dict):
+        if None in node.keys:
+            raise Unresolved("dict unpacking")
+        return {evaluate(k, env): evaluate(v, env) for k, v in zip(node.keys, node.values)}
+    if isinstance(node, ast.BinOp) and type(node.op) in _BIN_OPS:
+        return _BIN_OPS[type(node.op)](evaluate(node.left, env), evaluate(node.right, env))
+    if isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.USub):
+        return -evaluate(node.operand, env)
+    raise Unresolved(ast.dump(node))
+
+
+def _resolve_call(call: ast.Call, env: dict) -> Optional[Tuple[str, dict]]:
+    if not isinstance(call.func, ast.Name) or call.func.id not in TEX_CALLS or len(call.args) != 1:
+        return None
+    try:
+        tex = evaluate(call.args[0], env)
+        kwargs = {}
+        for keyword in call.keywords:
+            if keyword.arg is None:
+                kwargs.update(evaluate(keyword.value, env))
+            else:
+                kwargs[keyword.arg] = evaluate(keyword.value, env)
+    except Unresolved as e:
+        logging.debug(f"Skipping formula at line {call.lineno}: {e} is not a constant")
+        return None
+    return (tex, kwargs) if isinstance(tex, str) else None
+
+
+def _scan_body(body: List[ast.stmt], env: dict, formulas: List[Tuple[str, dict]]) -> None:
+    env = dict(env)
+    for statement in body:
+        if isinstance(statement, (ast.FunctionDef, ast.ClassDef)):
+            _scan_body(statement.body, env, formulas)
+            continue
+
+        if isinstance(statement, ast.ImportFrom) and statement.module and statement.module.startswith("primitives"):
+            module = importlib.import_module(statement.module)
+            for alias in statement.names:
+                if isinstance(getattr(module, alias.name, None), (str, dict)):
+                    env[alias.asname or alias.name] = getattr(module, alias.name)
+            continue
+
+        for node in ast.walk(statement):
+            if isinstance(node, ast.Call):
+                formula = _resolve_call(node, env)
+                if formula is not None:
+                    formulas.append(formula)
+
+        if isinstance(statement, ast.Assign) and len(statement.targets) == 1 \
+                and isinstance(statement.targets[0], ast.Name):
+            try:
+                env[statement.targets[0].id] = evaluate(statement.value, env)
+            except Unresolved:
+                env.pop(statement.targets[0].id, None)
+
+
+def scan_formulas(path: str) -> List[Tuple[str, dict]]:
+    """
+    Collects cached MathTex formulas of a scenario file
+    :param path: path to the scenario source
+    :return: list of (tex string, MathTex keyword arguments)
+    """
+    tree = ast.parse(Path(path).read_text(encoding="utf-8"), filename=str(path))
+    formulas = []
+    _scan_body(tree.body, {}, formulas)
+    return formulas
+
+
+def precompile_scenario(path: str, processes: Optional[int] = None) -> int:
+    formulas = scan_formulas(path)
+    # manifest formulas the scenario requests are already there with its arguments
+    scanned = {tex for tex, _ in formulas}
+    formulas += [(f, {}) for f in FORMULAS if f not in scanned]
+    return precompile(formulas, processes)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(format='%(asctime)s %(message)s', level=logging.INFO)
+    parser = argparse.ArgumentParser(description="Compiles formulas of scenarios in parallel")
+    parser.add_argument("scenarios", nargs="+", help="paths to scenario files")
+    parser.add_argument("-j", "--processes", type=int, default=None, help="number of worker processes")
+    args = parser.parse_args()
+
+    for scenario in args.scenarios:
+        n = precompile_scenario(scenario, args.processes)
+        logging.info(f"{scenario}: compiled {n} formulas")
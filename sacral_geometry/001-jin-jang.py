@@ -1,5 +1,6 @@
 from manim import *
 import numpy as np
+from geometry.shapes import JinJangVertices
 
 """
 Scenario:
@@ -15,59 +16,6 @@ Est. impl time: 2h
 """
 
 
-class JinJangVertices:
-    def __init__(self, radius: float):
-        self.radius = radius
-        self.step = 0.01
-
-    def get_left_half_circle(self):
-        vertices = []
-        for i in np.arange(-TAU / 2, 0, self.step):
-            vertices.append([
-                np.sin(i) * self.radius,
-                np.cos(i) * self.radius,
-                0])
-        return vertices
-
-    def get_right_half_circle(self):
-        vertices = []
-        for i in np.arange(-TAU / 2, 0, self.step):
-            vertices.append([
-                -np.sin(i) * self.radius,
-                np.cos(i) * self.radius,
-                0])
-        return vertices
-
-    def get_middle_s(self):
-        vertices = []
-        r_2 = self.radius / 2
-        for i in np.arange(0, TAU / 2, self.step):
-            vertices.append([np.sin(i) * r_2, np.cos(i) * r_2 + r_2, 0])
-
-        for i in np.arange(0, TAU / 2, self.step):
-            vertices.append([-np.sin(i) * r_2, np.cos(i) * r_2 - r_2, 0])
-        return vertices
-
-    def get_s_func(self, t: float):
-        r_2 = self.radius / 2
-        if 0 <= t <= TAU / 2:
-            return np.array([np.sin(t) * r_2, np.cos(t) * r_2 + r_2, 0])
-        elif TAU / 2 < t <= TAU:
-            return np.array([-np.sin(t - TAU / 2) * r_2, np.cos(t - TAU / 2) * r_2 - r_2, 0])
-        else:
-            raise ValueError(f"t should be between [0, TAU]")
-
-    def get_full_circle(self):
-        vertices = []
-        for i in np.arange(0, TAU + self.step, self.step):
-            vertices.append([
-                -np.cos(i + TAU / 4) * self.radius,
-                np.sin(i + TAU / 4) * self.radius,
-                0
-            ])
-        return vertices
-
-
 class Scenario(Scene):
     font = 'Monospace'
 
@@ -103,10 +51,7 @@ class Scenario(Scene):
                 *self.jj_vert.get_full_circle(),
                 **self.line_conf
             ),
-            ParametricFunction(
-                self.jj_vert.get_s_func,
-                t_range=np.array([0, TAU]),
-                **self.line_conf)
+            VMobject(**self.line_conf).set_points_smoothly(self.jj_vert.get_s_curve())
         ]
         for shape in self.to_remove:
             self.play(Create(shape))
@@ -119,10 +64,7 @@ class Scenario(Scene):
                 *self.jj_vert.get_full_circle(),
                 **self.line_conf
             ),
-            ParametricFunction(
-                self.jj_vert.get_s_func,
-                t_range=np.array([0, TAU]),
-                **self.line_conf),
+            VMobject(**self.line_conf).set_points_smoothly(self.jj_vert.get_s_curve()),
             self.top_circle,
             self.bottom_circle
         ])
@@ -132,20 +74,20 @@ class Scenario(Scene):
         ), run_time=2.0)
 
     def fill_jj_halves(self):
-        left_half_poly = Polygon(*[
-            *self.jj_vert.get_left_half_circle(),
-            *self.jj_vert.get_middle_s()
-        ])
+        left_half_poly = Polygon(*np.concatenate((
+            self.jj_vert.get_left_half_circle(),
+            self.jj_vert.get_middle_s()
+        )))
         conf_left = {
             "fill_opacity": 1,
             "stroke_width": 0,
             "color": WHITE
         }
 
-        right_half_poly = Polygon(*[
-            *self.jj_vert.get_middle_s(),
-            *self.jj_vert.get_right_half_circle()
-        ])
+        right_half_poly = Polygon(*np.concatenate((
+            self.jj_vert.get_middle_s(),
+            self.jj_vert.get_right_half_circle()
+        )))
         conf_right = {
             "fill_opacity": 1,
             "stroke_width": 0,
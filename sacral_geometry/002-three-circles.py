@@ -1,6 +1,8 @@
 from manim import *
 import numpy as np
 from scene_utils import WithIntroScenario
+from geometry.shapes import regular_polygon
+from geometry.utils import midpoint
 
 
 def distance(p1, p2):
@@ -11,17 +13,6 @@ def distance(p1, p2):
     )
 
 
-def get_vertices(radius, start_angle, center, n) -> list:
-    vertices = []
-    for i in range(0, n):
-        vertices.append(np.array([
-            np.cos(start_angle + i * TAU / n) * radius,
-            np.sin(start_angle + i * TAU / n) * radius,
-            0
-        ]) + np.array(center))
-    return vertices
-
-
 PRIMARY_COLOR = "#FFCD03"
 SECONDARY_COLOR = "#CFA600"
 PRIMARY_THICKNESS = 2.0
@@ -50,21 +41,14 @@ class Scenario(WithIntroScenario):
         alpha = 3 * PI / 2
         scale = 3.0
         r = 2 / np.sqrt(3) * scale
-        root_vertices = get_vertices(r, alpha, (0, 0, 0), 3)
-
-        root_centers = []
-        for (i, j) in zip([0, 1, 2], [1, 2, 0]):
-            root_centers.append([
-                (root_vertices[i][0] + root_vertices[j][0]) / 2,
-                (root_vertices[i][1] + root_vertices[j][1]) / 2,
-                (root_vertices[i][2] + root_vertices[j][2]) / 2,
-            ])
+        root_vertices = regular_polygon(r, alpha, 3)
+        root_centers = midpoint(root_vertices, np.roll(root_vertices, -1, axis=0))
 
         for i in range(0, 3):
             self.play(Create(Circle(radius=scale, **pcpt_conf).move_to(root_centers[i])), run_time=1)
 
         # dashed hexagon
-        hex_vertices = get_vertices(r, alpha, (0, 0, 0), 6)
+        hex_vertices = regular_polygon(r, alpha, 6)
         self.play(Create(DashedVMobject(Polygon(*hex_vertices, **scst_conf), num_dashes=36)), run_time=1)
 
         lines_to_center = []
@@ -76,7 +60,7 @@ class Scenario(WithIntroScenario):
 
         # inner hexagons
         for i in range(0, 3):
-            inner_hex_vertices = get_vertices(scale, -PI / 3 + TAU / 3 * i, root_centers[i], 6)
+            inner_hex_vertices = regular_polygon(scale, -PI / 3 + TAU / 3 * i, 6, root_centers[i])
             self.play(Create(Polygon(*inner_hex_vertices, **scst_conf)))
             self.play(Create(Polygon(*[
                 hex_vertices[2 * i + 1],
@@ -88,9 +72,9 @@ class Scenario(WithIntroScenario):
         outer_r2 = outer_r + 0.3
         self.play(Create(DashedVMobject(Circle(radius=outer_r2, **scst_conf), num_dashes=96)))
 
-        satellites: list = list(map(lambda x: (x, 0.1), get_vertices(outer_r2, 0, (0, 0, 0), 4)))
-        satellites.extend(map(lambda x: (x, 0.05), get_vertices(outer_r2, PI / 12, (0, 0, 0), 4)))
-        satellites.extend(map(lambda x: (x, 0.05), get_vertices(outer_r2, - PI / 12, (0, 0, 0), 4)))
+        satellites: list = list(map(lambda x: (x, 0.1), regular_polygon(outer_r2, 0, 4)))
+        satellites.extend(map(lambda x: (x, 0.05), regular_polygon(outer_r2, PI / 12, 4)))
+        satellites.extend(map(lambda x: (x, 0.05), regular_polygon(outer_r2, - PI / 12, 4)))
         sat_anim = []
         for s in satellites:
             sat_anim.append(
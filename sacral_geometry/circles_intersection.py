@@ -1,37 +1,43 @@
 from math import sqrt, sin, cos
 from manim import *
-from geometry.utils import Point, find_circles_intersection
+from geometry.utils import circles_intersections
+
+DURATION = 5
 
 
 class Scenario(Scene):
     def __init__(self):
         super().__init__()
-        self.a = Point(-0.3, 0.0)
-        self.b = Point(0.3, 0.0)
+        self.a = np.array((-0.3, 0.0, 0.0))
+        self.b = np.array((0.3, 0.0, 0.0))
         self.r = 1.5
 
-        self.c1 = Circle(radius=self.r, color=RED).move_to(self.a.to_array())
-        self.c2 = Circle(radius=self.r, color=BLUE).move_to(self.b.to_array())
+        self.c1 = Circle(radius=self.r, color=RED).move_to(self.a)
+        self.c2 = Circle(radius=self.r, color=BLUE).move_to(self.b)
 
         self.group = VGroup(self.c1, self.c2)
         self.time = ValueTracker(0)
-        self.dots = [Dot(), Dot()]
+        self.dots = [Dot(color=YELLOW), Dot(color=YELLOW)]
+
+        # tracks of the moving center and of the intersections for every frame
+        self.times = np.linspace(0, DURATION, int(DURATION * config.frame_rate) + 1)
+        self.a_track = np.stack(
+            (-0.3 * np.cos(self.times), 0.3 * np.sin(self.times), np.zeros_like(self.times)), axis=1)
+        self.intersections = circles_intersections(self.a_track, self.b, self.r, self.r)
 
     def _updater(self, _: VGroup) -> None:
-        now = self.time.get_value()
-        self.a = Point(-0.3 * cos(now), 0.3 * sin(now))
-        self.c1.become(Circle(radius=self.r, color=RED).move_to(self.a.to_array()))
+        frame = min(int(round(self.time.get_value() / DURATION * (len(self.times) - 1))), len(self.times) - 1)
+        self.a = self.a_track[frame]
+        self.c1.move_to(self.a)
 
-        intersections = find_circles_intersection(self.a, self.b, self.r)
-        for i, p in enumerate(intersections):
-            dot = Dot(point=p.to_array(), color=YELLOW)
-            self.dots[i].become(dot)
+        for dot, p in zip(self.dots, self.intersections[frame]):
+            dot.move_to(p)
 
     def construct(self):
         self.add(self.group)
         self.add(*self.dots)
         self.group.add_updater(self._updater)
-        self.play(self.time.animate.set_value(5), run_time=5, rate_func=rate_functions.linear)
+        self.play(self.time.animate.set_value(DURATION), run_time=DURATION, rate_func=rate_functions.linear)
 
 
 if __name__ == "__main__":
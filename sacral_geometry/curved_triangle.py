@@ -15,7 +15,8 @@ Scenario:
 from typing import List
 from manim import *
 from numpy import sin, cos, sqrt
-from geometry.utils import Point, find_circles_intersection
+from geometry.utils import circles_intersections, dist2, farthest, rotate_about
+from primitives import DashedCircle
 
 DEFAULT_SIDE = 4
 DEFAULT_R = sqrt(3) / 2 * (2 * DEFAULT_SIDE)
@@ -23,21 +24,14 @@ DEFAULT_R = sqrt(3) / 2 * (2 * DEFAULT_SIDE)
 PRIMARY_COLOR = YELLOW
 SECONDARY_COLOR = BLUE
 
+START_ANGLE = 0.01
+END_ANGLE = PI / 8
+ROTATION_TIME = 2.5
 
-def rotate_about(x: List[float], o: List[float], a: float) -> List[float]:
-    _x, _y = x[0] - o[0], x[1] - o[1]
-    c, s = cos(a), sin(a)
-    _x_ = c * _x - s * _y
-    _y_ = s * _x + c * _y
-    return [o[0] + _x_, o[1] + _y_, 0]
 
-
-def get_triangle_vertexes(R: float = DEFAULT_SIDE) -> List[List[float]]:
-    vs = []
-    for i in range(3):
-        a = i * TAU / 3
-        vs.append([R * sin(a), R * cos(a), 0])
-    return vs
+def get_triangle_vertexes(R: float = DEFAULT_SIDE) -> np.ndarray:
+    a = np.arange(3) * TAU / 3
+    return np.stack((R * sin(a), R * cos(a), np.zeros(3)), axis=1)
 
 
 def get_triangle_lines(vs: List[List[float]]):
@@ -50,76 +44,55 @@ def get_triangle_lines(vs: List[List[float]]):
 class Scenario(Scene):
     def __init__(self):
         super().__init__()
-        self.time = ValueTracker(0.01)
+        self.time = ValueTracker(START_ANGLE)
         self.vs = get_triangle_vertexes()
 
+        # tracks of the rotation for every frame: helper circles centers, arc ends and arc angles
+        vs = self.vs
+        self.angles = np.linspace(START_ANGLE, END_ANGLE, int(ROTATION_TIME * config.frame_rate) + 1)
+        self.centers = rotate_about(vs, vs[[2, 0, 1]], self.angles[:, np.newaxis])
+        intersections = circles_intersections(self.centers, self.centers[:, [1, 2, 0]], DEFAULT_R, DEFAULT_R)
+        self.marks = farthest(vs, intersections)
+        # same angle as ArcBetweenPoints(start=v, end=mark, radius=DEFAULT_R)
+        self.arc_angles = 2 * np.arcsin(np.sqrt(dist2(vs, self.marks)) / (2 * DEFAULT_R))
+        self.opacities = np.select(
+            [self.angles <= PI / 16, self.angles < 3 * PI / 24],
+            [1, 20.372 * self.angles - 3],
+            default=0)
+
         self.helper_circles = [
-            DashedVMobject(
-                Circle(radius=DEFAULT_R, stroke_color=SECONDARY_COLOR, stroke_width=1),
-                num_dashes=128).move_to(v)
+            DashedCircle(radius=DEFAULT_R, num_dashes=128, center=v, stroke_color=SECONDARY_COLOR, stroke_width=1)
             for v in self.vs
         ]
+        self.center_dots = [Dot(v, color=SECONDARY_COLOR, radius=0.05) for v in self.vs]
+        self.marks_dots = [Dot(mark, color=PRIMARY_COLOR) for mark in self.marks[0]]
+        self.arcs = [
+            ArcBetweenPoints(start=v, end=mark, radius=DEFAULT_R, stroke_color=PRIMARY_COLOR)
+            for v, mark in zip(self.vs, self.marks[0])
+        ]
 
-        self.group = VGroup(*[
-            # 0..2; helper circles center dots
-            *[Dot() for _ in range(3)],
-
-            # 3..5; helper circles
-            *self.helper_circles,
-
-            # 6..8; intersection marks
-            Dot(), Dot(), Dot(),
+        self.group = VGroup(*self.center_dots, *self.helper_circles, *self.marks_dots, *self.arcs)
 
-            # 9..11
-            ArcBetweenPoints(start=ORIGIN, end=ORIGIN, angle=0, color=PRIMARY_COLOR),
-            ArcBetweenPoints(start=ORIGIN, end=ORIGIN, angle=0, color=PRIMARY_COLOR),
-            ArcBetweenPoints(start=ORIGIN, end=ORIGIN, angle=0, color=PRIMARY_COLOR),
-        ])
+    def get_frame(self) -> int:
+        angle = self.time.get_value()
+        frame = int(round((angle - START_ANGLE) / (END_ANGLE - START_ANGLE) * (len(self.angles) - 1)))
+        return min(max(frame, 0), len(self.angles) - 1)
 
     def _updater(self, _: VGroup) -> None:
-        vs = self.vs
-        angle = self.time.get_value()
+        frame = self.get_frame()
+
+        # c1, c2, c3 rotate about the previous vertex
+        for dot, circle, c in zip(self.center_dots, self.helper_circles, self.centers[frame]):
+            dot.move_to(c).set_opacity(self.opacities[frame])
+            circle.move_center_to(c)
 
-        # moving helper circles centers
-        c1 = rotate_about(vs[0], vs[2], angle)
-        c2 = rotate_about(vs[1], vs[0], angle)
-        c3 = rotate_about(vs[2], vs[1], angle)
-
-        opacity = 1
-        if PI / 16 < angle < 3 * PI / 24:
-            opacity = 20.372 * angle - 3
-        elif angle >= 3 * PI / 24:
-            opacity = 0
-
-        print(angle, opacity)
-
-        self.group[0].become(Dot(c1, color=SECONDARY_COLOR, radius=0.05).set_opacity(opacity))
-        self.group[1].become(Dot(c2, color=SECONDARY_COLOR, radius=0.05).set_opacity(opacity))
-        self.group[2].become(Dot(c3, color=SECONDARY_COLOR, radius=0.05).set_opacity(opacity))
-
-        # moving helper circles themselves
-        self.group[3].become(
-            DashedVMobject(Circle(radius=DEFAULT_R, stroke_color=SECONDARY_COLOR, stroke_width=1),
-                           num_dashes=128).move_to(c1))
-        self.group[4].become(
-            DashedVMobject(Circle(radius=DEFAULT_R, stroke_color=SECONDARY_COLOR, stroke_width=1),
-                           num_dashes=128).move_to(c2))
-        self.group[5].become(
-            DashedVMobject(Circle(radius=DEFAULT_R, stroke_color=SECONDARY_COLOR, stroke_width=1),
-                           num_dashes=128).move_to(c3))
-
-        # moving arcs
-        for i, ((a, b), v, c) in enumerate([((c1, c2), vs[0], c3), ((c2, c3), vs[1], c1), ((c3, c1), vs[2], c2)]):
-            intersections = find_circles_intersection(Point.from_array(a), Point.from_array(b), DEFAULT_R)
-            nearest = Point.from_array(v).find_farthest(intersections)
-            self.group[6 + i].become(Dot(nearest.to_array(), color=PRIMARY_COLOR))
-            self.group[9 + i].become(ArcBetweenPoints(
-                start=v,
-                end=nearest.to_array(),
-                radius=DEFAULT_R,
-                arc_center=c,
-                stroke_color=PRIMARY_COLOR,
-            ))
+        # each arc ends at the far intersection of the two circles following its vertex
+        for dot, arc, v, mark, angle in zip(self.marks_dots, self.arcs, self.vs, self.marks[frame],
+                                            self.arc_angles[frame]):
+            dot.move_to(mark)
+            arc.angle = angle
+            arc.generate_points()
+            arc.put_start_and_end_on(v, mark)
 
     def construct(self):
         vs = self.vs
@@ -154,15 +127,12 @@ class Scenario(Scene):
         self.add(self.group)
         self.group.add_updater(self._updater)
 
-        self.play(self.time.animate.set_value(PI / 8), run_time=2.5, rate_func=rate_functions.linear)
+        self.play(self.time.animate.set_value(END_ANGLE), run_time=ROTATION_TIME, rate_func=rate_functions.linear)
 
         self.wait(0.5)
 
 
 if __name__ == "__main__":
-    import sys
-
-    print(sys.version)
     config.frame_size = (1080, 1080)
     scene = Scenario()
     scene.render()
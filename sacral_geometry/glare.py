@@ -0,0 +1,19 @@
+from manim import *
+from primitives import GlareText, Glare
+
+
+class Scenario(Scene):
+    def construct(self):
+        text = GlareText("Sacral geometry", font_size=96, color=YELLOW_B)
+        self.add(text)
+        self.wait(0.5)
+        for _ in range(3):
+            self.play(Glare(text, run_time=1.5))
+            self.wait(0.5)
+
+
+if __name__ == "__main__":
+    config.frame_size = (1080, 1080)
+    scene = Scenario()
+
+    scene.render()